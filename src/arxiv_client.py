@@ -1,11 +1,21 @@
 import arxiv
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from config import settings
+from author_index import AuthorWatchlist
+from arxiv_feed import AtomFeedClient, ConditionalFetcher, ListingFeedClient, DEFAULT_API_URL, DEFAULT_LISTING_URL
 
 logger = logging.getLogger(__name__)
 
+# Strongest first; used to pick the label of a paper listed under several categories.
+_ANNOUNCE_RANK = {"new": 0, "cross": 1, "replace": 2}
+
+
+class ArxivFetchError(RuntimeError):
+    """The arXiv query or feed failed part-way; the result set is incomplete."""
+
+
 class ArxivClient:
     def __init__(self):
         self.client = arxiv.Client(
@@ -13,16 +23,41 @@ class ArxivClient:
             delay_seconds=3.0,
             num_retries=3
         )
+        self.feed_client = None
+        self.listing_client = None
+        self.watchlist = AuthorWatchlist()
+        if not settings:
+            return
+
+        self.watchlist = AuthorWatchlist(settings.watchlist_authors, settings.watchlist_affiliations)
+
+        use_atom = settings.fetch_backend == "atom"
+        use_listing = settings.fetch_source == "listing"
+        if use_atom or use_listing:
+            # One keep-alive session (and validator cache) shared by both feed clients.
+            fetcher = ConditionalFetcher(cache_dir=settings.arxiv_cache_dir)
+            if use_atom:
+                self.feed_client = AtomFeedClient(api_url=settings.arxiv_api_url or DEFAULT_API_URL, fetcher=fetcher)
+            if use_listing:
+                self.listing_client = ListingFeedClient(base_url=settings.arxiv_listing_url or DEFAULT_LISTING_URL, fetcher=fetcher)
 
     def fetch_papers(self, top_n: int = 10) -> List[Dict[str, Any]]:
         """
         Fetch papers from ArXiv based on configuration.
 
         Notes:
-            - Applies a 24-hour time window filter on `published` (UTC).
-            - Performs keyword filtering on title + abstract.
-            - Ranks matched papers by a simple relevance score computed from keyword hits,
-              and returns only the top `top_n` papers (highest relevance first).
+            - Applies a 24-hour time window filter on `published` (UTC), unless the
+              `listing` source is configured, in which case the day's announcement
+              feed of each category is used as-is (filtered by announce type).
+            - Performs keyword filtering on title + abstract; papers by watched authors or
+              affiliations are kept regardless of keywords.
+            - Ranks matched papers by a simple relevance score computed from keyword hits
+              plus `watchlist.weight` per watchlist hit, and returns only the top `top_n`
+              papers (highest relevance first).
+
+        Raises:
+            ArxivFetchError: if arXiv could not be read. An empty list means the
+            fetch succeeded and nothing matched, so callers can tell the two apart.
         """
         if not isinstance(top_n, int) or top_n <= 0:
             raise ValueError("top_n must be a positive integer")
@@ -39,31 +74,34 @@ class ArxivClient:
             logger.warning("No subjects configured for ArXiv search.")
             return []
 
-        # Construct query: cat:subject1 OR cat:subject2 ...
-        # Note: ArXiv API query syntax is limited. 
-        # "cat:cs.CV OR cat:cs.LG" is standard.
-        query_parts = [f"cat:{subject}" for subject in subjects]
-        query = " OR ".join(query_parts)
-        
-        logger.info(f"Querying ArXiv with: {query}")
-
-        search = arxiv.Search(
-            query=query,
-            max_results=200, # Fetch enough to cover last 24h
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-            sort_order=arxiv.SortOrder.Descending
-        )
+        if self.listing_client is not None:
+            logger.info(f"Reading ArXiv announcement listings for: {', '.join(subjects)}")
+            candidates = self._iter_listings(subjects, settings.announce_types)
+            cutoff_time = None
+        else:
+            # Construct query: cat:subject1 OR cat:subject2 ...
+            # Note: ArXiv API query syntax is limited. 
+            # "cat:cs.CV OR cat:cs.LG" is standard.
+            query_parts = [f"cat:{subject}" for subject in subjects]
+            query = " OR ".join(query_parts)
 
-        results = []
-        try:
+            logger.info(f"Querying ArXiv with: {query}")
+            candidates = self._iter_results(query, max_results=200) # Fetch enough to cover last 24h
             # We need to filter for the last 24 hours.
             # ArXiv updated/published dates are in UTC.
             cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-            
+
+        results = []
+        try:
             # Using generator to fetch
-            for result in self.client.results(search):
+            for result in candidates:
+                if cutoff_time is not None and result.published is None:
+                    # Without a date the entry cannot be placed in the window; skip it
+                    # rather than failing the whole fetch over one bad entry.
+                    logger.warning(f"Skipping ArXiv entry without a usable date: {result.entry_id}")
+                    continue
                 # result.published is datetime with timezone
-                if result.published < cutoff_time:
+                if cutoff_time is not None and result.published < cutoff_time:
                     # Since results are sorted by submitted date descending, 
                     # once we hit a paper older than 24h, we can stop IF we trust the sort.
                     # However, sometimes submission != publication. 
@@ -78,25 +116,25 @@ class ArxivClient:
                          break
                     continue
                 
-                # Keyword Filtering
-                if self._matches_keywords(result, keywords, match_logic):
-                    relevance_score = self._compute_relevance_score(result, keywords)
-                    paper_data = {
-                        "title": result.title,
-                        "authors": [a.name for a in result.authors],
-                        "summary": result.summary,
-                        "published": result.published,
-                        "pdf_url": result.pdf_url,
-                        "entry_id": result.entry_id,
-                        "categories": result.categories,
-                        "_relevance_score": relevance_score
-                    }
+                paper_data = self._to_paper(result, keywords, match_logic)
+                if paper_data is not None:
+                    if self.listing_client is not None:
+                        paper_data["announce_type"] = result.announce_type
                     results.append(paper_data)
                     
         except Exception as e:
             logger.error(f"Error fetching papers from ArXiv: {e}")
-            
-        results.sort(key=lambda p: (p.get("_relevance_score", 0), p.get("published")), reverse=True)
+            raise ArxivFetchError(str(e)) from e
+        finally:
+            # Release the feed once we have left the time window. Without a cache dir
+            # this drops the connection; with one, ConditionalFetcher reads the rest
+            # of the body first so the cached copy stays valid for later 304s.
+            close = getattr(candidates, "close", None)
+            if close:
+                close()
+
+        undated = datetime.min.replace(tzinfo=timezone.utc)
+        results.sort(key=lambda p: (p.get("_relevance_score", 0), p.get("published") or undated), reverse=True)
         limited = results[:top_n]
         for p in limited:
             p.pop("_relevance_score", None)
@@ -104,6 +142,109 @@ class ArxivClient:
         logger.info(f"Found {len(limited)} papers matching criteria.")
         return limited
 
+    def fetch_papers_between(self, start: datetime, end: datetime, max_results: int = 2000) -> List[Dict[str, Any]]:
+        """
+        Fetch every matching paper submitted in [start, end), newest first.
+
+        Used to fill a `PaperStore` for backfills. Applies the same keyword and
+        watchlist filtering as `fetch_papers`, but no top-N cut and no time window
+        (the range is part of the query). Always uses the search API, since the
+        listing feeds only cover the current announcement day.
+
+        Raises:
+            ArxivFetchError: if arXiv could not be read.
+        """
+        if not settings or not settings.subjects:
+            logger.warning("No subjects configured for ArXiv search.")
+            return []
+
+        categories = " OR ".join(f"cat:{subject}" for subject in settings.subjects)
+        date_range = f"submittedDate:[{start.strftime('%Y%m%d%H%M')} TO {end.strftime('%Y%m%d%H%M')}]"
+        query = f"({categories}) AND {date_range}"
+        logger.info(f"Querying ArXiv with: {query}")
+
+        candidates = self._iter_results(query, max_results=max_results)
+        results = []
+        try:
+            for result in candidates:
+                paper_data = self._to_paper(result, settings.keywords, settings.match_logic)
+                if paper_data is not None:
+                    paper_data.pop("_relevance_score", None)
+                    results.append(paper_data)
+        except Exception as e:
+            logger.error(f"Error fetching papers from ArXiv: {e}")
+            raise ArxivFetchError(str(e)) from e
+        finally:
+            close = getattr(candidates, "close", None)
+            if close:
+                close()
+
+        logger.info(f"Found {len(results)} papers matching criteria between {start:%Y-%m-%d} and {end:%Y-%m-%d}.")
+        return results
+
+    def _to_paper(self, result: Any, keywords: List[str], match_logic: str) -> Optional[Dict[str, Any]]:
+        """Paper dict for a result that passes the watchlist/keyword filter, else None."""
+        watch_hits = self.watchlist.match(result.authors)
+        if not watch_hits and not self._matches_keywords(result, keywords, match_logic):
+            return None
+
+        relevance_score = self._compute_relevance_score(result, keywords)
+        if watch_hits:
+            relevance_score += settings.watchlist_weight * len(watch_hits)
+        paper_data = {
+            "title": result.title,
+            "authors": [a.name for a in result.authors],
+            "summary": result.summary,
+            "published": result.published,
+            "pdf_url": result.pdf_url,
+            "entry_id": result.entry_id,
+            "categories": result.categories,
+            "watchlist_hits": watch_hits,
+            "_relevance_score": relevance_score
+        }
+        return paper_data
+
+    def _iter_results(self, query: str, max_results: int) -> Iterator[Any]:
+        """
+        Yield search results newest first, from the configured backend.
+
+        Both backends yield objects exposing the `arxiv.Result` attributes used below.
+        """
+        if self.feed_client is not None:
+            return self.feed_client.iter_entries(query, max_results=max_results)
+
+        search = arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        return self.client.results(search)
+
+    def _iter_listings(self, subjects: List[str], announce_types: List[str]) -> Iterator[Any]:
+        """
+        Yield the current announcement entries of each category, one request per category.
+
+        Cross-lists show up under every category they are listed in, so entries are
+        de-duplicated by `entry_id` across feeds. A duplicate keeps its strongest
+        announce type (new > cross > replace), so a paper announced as new in its
+        primary category is labelled new whatever the order of `subjects`.
+        """
+        wanted = {t.lower() for t in announce_types}
+        merged: Dict[str, Any] = {}
+        for subject in subjects:
+            count = 0
+            for entry in self.listing_client.iter_entries(subject):
+                count += 1
+                kept = merged.get(entry.entry_id)
+                if kept is None or _ANNOUNCE_RANK.get(entry.announce_type, 99) < _ANNOUNCE_RANK.get(kept.announce_type, 99):
+                    merged[entry.entry_id] = entry
+            logger.info(f"Listing {subject}: read {count} entries")
+
+        for entry in merged.values():
+            if entry.announce_type in wanted:
+                yield entry
+
     def _matches_keywords(self, paper: arxiv.Result, keywords: List[str], logic: str) -> bool:
         """
         Check if paper matches keyword criteria.
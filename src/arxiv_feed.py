@@ -0,0 +1,355 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://export.arxiv.org/api/query"
+DEFAULT_LISTING_URL = "https://rss.arxiv.org/rss"
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+# Raw `arxiv:announce_type` values mapped onto the three classes we distinguish.
+ANNOUNCE_TYPES = {
+    "new": "new",
+    "cross": "cross",
+    "replace": "replace",
+    "replace-cross": "replace",
+}
+
+
+@dataclass
+class FeedAuthor:
+    name: str
+    affiliation: Optional[str] = None
+
+
+@dataclass
+class FeedEntry:
+    """
+    Lightweight stand-in for `arxiv.Result`.
+
+    Only carries the fields `ArxivClient.fetch_papers` actually reads, under the
+    same attribute names, so keyword filtering and ranking work on either type.
+    """
+    entry_id: str
+    title: str
+    summary: str
+    published: Optional[datetime]
+    authors: List[FeedAuthor] = field(default_factory=list)
+    pdf_url: Optional[str] = None
+    categories: List[str] = field(default_factory=list)
+    # Only set for listing feeds: "new", "cross" (cross-list) or "replace" (replacement).
+    announce_type: Optional[str] = None
+
+
+class ConditionalFetcher:
+    """
+    Streams HTTP bodies over a persistent keep-alive session.
+
+    When `cache_dir` is set, the last body and its ETag/Last-Modified validators
+    are stored per URL, and the next request is sent as a conditional GET. A 304
+    response is served from the cached body without downloading it again.
+
+    If the consumer stops early, an uncached stream is dropped immediately. A
+    cached one is drained to the end first: a truncated copy could not back a
+    later 304, and the remainder is at most one result page.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        timeout: float = 30.0,
+        chunk_size: int = 16 * 1024,
+        session: Optional[requests.Session] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "arxiv-daily-digest")
+
+    def stream(self, url: str, params: Optional[Dict[str, Any]] = None, replay_cached: bool = True) -> Iterator[bytes]:
+        """
+        Yield the response body for `url` chunk by chunk as it arrives.
+
+        On a 304 the cached body is replayed, unless `replay_cached` is False, in
+        which case nothing is yielded (the caller only wants new content).
+        """
+        prepared = requests.Request("GET", url, params=params).prepare().url
+        body_path, meta_path = self._cache_paths(prepared)
+
+        headers = {}
+        meta = self._load_meta(meta_path) if body_path and os.path.exists(body_path) else {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.session.get(prepared, headers=headers, stream=True, timeout=self.timeout)
+        try:
+            if response.status_code == 304 and body_path:
+                if not replay_cached:
+                    logger.info(f"Feed not modified, nothing new: {prepared}")
+                    return
+                logger.info(f"Feed not modified, using cached copy: {prepared}")
+                yield from self._read_cached(body_path)
+                return
+
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=self.chunk_size)
+
+            if not body_path:
+                yield from chunks
+                return
+
+            tmp_path = body_path + ".part"
+            complete = False
+            try:
+                with open(tmp_path, "wb") as cache_file:
+                    try:
+                        for chunk in chunks:
+                            cache_file.write(chunk)
+                            yield chunk
+                    except GeneratorExit:
+                        # The consumer stopped early (e.g. results fell out of the time
+                        # window); drain the rest so the cached copy is complete.
+                        complete = self._drain(chunks, cache_file)
+                        raise
+                complete = True
+            finally:
+                if complete:
+                    os.replace(tmp_path, body_path)
+                    self._save_meta(meta_path, response.headers)
+                elif os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        finally:
+            response.close()
+
+    def _cache_paths(self, url: str):
+        if not self.cache_dir:
+            return None, None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".xml", base + ".json"
+
+    def _drain(self, chunks: Iterator[bytes], cache_file) -> bool:
+        try:
+            for chunk in chunks:
+                cache_file.write(chunk)
+            return True
+        except requests.RequestException as e:
+            logger.warning(f"Could not finish caching feed body: {type(e).__name__}: {e}")
+            return False
+
+    def _read_cached(self, body_path: str) -> Iterator[bytes]:
+        with open(body_path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _load_meta(self, meta_path: str) -> Dict[str, Any]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, meta_path: str, headers) -> None:
+        meta = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+
+class AtomFeedClient:
+    """
+    Queries the arXiv export API directly and parses the Atom response incrementally.
+    """
+
+    def __init__(self, api_url: str = DEFAULT_API_URL, fetcher: Optional[ConditionalFetcher] = None):
+        self.api_url = api_url
+        self.fetcher = fetcher or ConditionalFetcher()
+
+    def iter_entries(
+        self,
+        query: str,
+        max_results: int = 200,
+        sort_by: str = "submittedDate",
+        sort_order: str = "descending",
+    ) -> Iterator[FeedEntry]:
+        params = {
+            "search_query": query,
+            "start": 0,
+            "max_results": max_results,
+            "sortBy": sort_by,
+            "sortOrder": sort_order,
+        }
+        with closing(iter_atom_entries(self.fetcher.stream(self.api_url, params))) as entries:
+            for entry in entries:
+                # The API reports malformed queries as a single pseudo-entry with HTTP 200.
+                if "/api/errors" in entry.entry_id:
+                    raise RuntimeError(f"ArXiv API error: {entry.summary}")
+                yield entry
+
+
+class ListingFeedClient:
+    """
+    Reads arXiv's daily per-category announcement feeds (the RSS listings).
+
+    Each feed holds exactly one announcement cycle, so a single request per
+    category replaces paging through search results by submission date. An
+    unchanged feed (304) is the announcement already read, so it yields no
+    entries instead of replaying it.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_LISTING_URL, fetcher: Optional[ConditionalFetcher] = None):
+        self.base_url = base_url.rstrip("/")
+        self.fetcher = fetcher or ConditionalFetcher()
+
+    def iter_entries(self, category: str) -> Iterator[FeedEntry]:
+        url = f"{self.base_url}/{category}"
+        with closing(iter_listing_entries(self.fetcher.stream(url, replay_cached=False))) as entries:
+            yield from entries
+
+
+def iter_atom_entries(chunks: Iterable[bytes]) -> Iterator[FeedEntry]:
+    """
+    Parse an arXiv Atom feed from a stream of byte chunks, yielding each entry
+    as soon as its closing tag has been received.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from _drain_entries(parser, ATOM_NS + "entry", _entry_from_element)
+    finally:
+        # Closing the source lets the fetcher finish or abandon the download promptly.
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+    parser.close()
+    yield from _drain_entries(parser, ATOM_NS + "entry", _entry_from_element)
+
+
+def iter_listing_entries(chunks: Iterable[bytes]) -> Iterator[FeedEntry]:
+    """
+    Parse an arXiv RSS announcement feed from a stream of byte chunks.
+
+    An empty stream (the fetcher's answer for an unchanged feed) yields nothing.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    received = False
+    try:
+        for chunk in chunks:
+            received = True
+            parser.feed(chunk)
+            yield from _drain_entries(parser, "item", _entry_from_item)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+    if not received:
+        return
+    parser.close()
+    yield from _drain_entries(parser, "item", _entry_from_item)
+
+
+def _drain_entries(parser: ET.XMLPullParser, tag: str, build) -> Iterator[FeedEntry]:
+    for _, elem in parser.read_events():
+        if elem.tag == tag:
+            entry = build(elem)
+            elem.clear()
+            yield entry
+
+
+def _entry_from_element(elem: ET.Element) -> FeedEntry:
+    authors = []
+    for author in elem.findall(ATOM_NS + "author"):
+        authors.append(FeedAuthor(
+            name=_text(author.find(ATOM_NS + "name")),
+            affiliation=_text(author.find(ARXIV_NS + "affiliation")) or None,
+        ))
+
+    pdf_url = None
+    for link in elem.findall(ATOM_NS + "link"):
+        if link.get("title") == "pdf":
+            pdf_url = link.get("href")
+            break
+
+    return FeedEntry(
+        entry_id=_text(elem.find(ATOM_NS + "id")),
+        title=re.sub(r"\s+", " ", _text(elem.find(ATOM_NS + "title"))),
+        summary=_text(elem.find(ATOM_NS + "summary")),
+        # Fall back to <updated> so one malformed date does not leave the entry undated.
+        published=(_parse_datetime(_text(elem.find(ATOM_NS + "published")))
+                   or _parse_datetime(_text(elem.find(ATOM_NS + "updated")))),
+        authors=authors,
+        pdf_url=pdf_url,
+        categories=[c.get("term") for c in elem.findall(ATOM_NS + "category") if c.get("term")],
+    )
+
+
+def _entry_from_item(elem: ET.Element) -> FeedEntry:
+    # guid looks like "oai:arXiv.org:2405.07001v1"
+    arxiv_id = _text(elem.find("guid")).rsplit(":", 1)[-1]
+
+    # description looks like "arXiv:2405.07001v1 Announce Type: new \nAbstract: ..."
+    description = _text(elem.find("description"))
+    _, sep, abstract = description.partition("Abstract:")
+    summary = abstract.strip() if sep else description
+
+    creators = _text(elem.find(DC_NS + "creator"))
+    raw_type = _text(elem.find(ARXIV_NS + "announce_type")).lower()
+
+    return FeedEntry(
+        entry_id=f"http://arxiv.org/abs/{arxiv_id}",
+        title=re.sub(r"\s+", " ", _text(elem.find("title"))),
+        summary=summary,
+        published=_parse_rfc822(_text(elem.find("pubDate"))),
+        authors=[FeedAuthor(name=n.strip()) for n in creators.split(",") if n.strip()],
+        pdf_url=f"http://arxiv.org/pdf/{arxiv_id}",
+        categories=[_text(c) for c in elem.findall("category") if _text(c)],
+        announce_type=ANNOUNCE_TYPES.get(raw_type, raw_type or None),
+    )
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    if elem is None or elem.text is None:
+        return ""
+    return elem.text.strip()
+
+
+def _parse_rfc822(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_datetime(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
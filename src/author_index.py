@@ -0,0 +1,175 @@
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r"[^\w\s]|_")
+_SPACE_RE = re.compile(r"\s+")
+# Family-name particles, compared after normalization.
+_PARTICLES = {"van", "von", "der", "den", "de", "del", "della", "di", "da", "du", "dos", "das", "la", "le", "ter", "ten", "bin", "al"}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase, strip diacritics and punctuation, collapse whitespace.
+
+    "José  García-López" -> "jose garcia lopez"
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    # Letters with no decomposition that still commonly appear in names.
+    stripped = stripped.replace("ø", "o").replace("Ø", "O").replace("ł", "l").replace("Ł", "L").replace("ß", "ss")
+    return _SPACE_RE.sub(" ", _NON_WORD_RE.sub(" ", stripped.lower())).strip()
+
+
+def split_name(name: str) -> Tuple[List[str], str]:
+    """
+    Split a personal name into (given-name tokens, family name).
+
+    Handles both "Given Family" and "Family, Given" order. Lowercase particles
+    ("van", "de", ...) in front of the last token belong to the family name, so
+    "Ludwig van Beethoven", "van Beethoven, Ludwig" and "Beethoven, Ludwig van"
+    all split into (["ludwig"], "van beethoven").
+    """
+    if "," in name:
+        family, _, given = name.partition(",")
+        tokens = normalize_text(given).split()
+        family_tokens = normalize_text(family).split()
+        # "Beethoven, Ludwig van": trailing particles of the given part move to the family name.
+        while len(tokens) > 1 and tokens[-1] in _PARTICLES:
+            family_tokens.insert(0, tokens.pop())
+        return tokens, " ".join(family_tokens)
+
+    tokens = normalize_text(name).split()
+    if not tokens:
+        return [], ""
+    split = len(tokens) - 1
+    # Keep at least one given-name token, so "De Li" stays given "de", family "li".
+    while split > 1 and tokens[split - 1] in _PARTICLES:
+        split -= 1
+    return tokens[:split], " ".join(tokens[split:])
+
+
+def _keys(given: List[str], family: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (full key, initial key) for a split name; either may be None.
+
+    Middle names are ignored so "John A. Smith" and "John Smith" share a full key.
+    """
+    if not family or not given:
+        return None, None
+    full = f"{given[0]} {family}" if len(given[0]) > 1 else None
+    return full, f"{given[0][0]} {family}"
+
+
+class AuthorWatchlist:
+    """
+    Prebuilt hash index over watched authors and affiliations.
+
+    Every watchlist name is indexed under normalized keys; two-token names are
+    also indexed by their full name in swapped order ("Wei Zhang" also matches
+    "Zhang Wei", but not "Z. Wei"). Matching a paper then costs a few dict lookups
+    per author, independent of the watchlist size:
+
+    - full first+family names match exactly (after normalization);
+    - an abbreviated name on either side ("J. Smith") matches on first initial + family name;
+    - single-token names ("Madonna") match only authors listed under that same
+      single name, never a family name, to avoid matching every "X Madonna".
+
+    Affiliations are matched as whole normalized phrases inside an author's
+    affiliation string, by looking up its token n-grams.
+    """
+
+    def __init__(self, authors: Iterable[str] = (), affiliations: Iterable[str] = ()):
+        self._full: Dict[str, str] = {}
+        self._initial_all: Dict[str, Set[str]] = {}
+        self._initial_abbrev: Dict[str, Set[str]] = {}
+        self._mononyms: Dict[str, str] = {}
+        self._affiliations: Dict[str, str] = {}
+        self._max_affiliation_tokens = 0
+
+        for label in authors or ():
+            self.add_author(str(label))
+        for label in affiliations or ():
+            self.add_affiliation(str(label))
+
+    def __bool__(self) -> bool:
+        return bool(self._initial_all or self._mononyms or self._affiliations)
+
+    def add_author(self, label: str) -> None:
+        given, family = split_name(label)
+        if not family:
+            logger.warning(f"Ignoring watchlist author {label!r}: no name left after normalization.")
+            return
+        if not given:
+            self._mononyms.setdefault(family, label)
+            return
+        full, initial = _keys(given, family)
+        if full:
+            self._full.setdefault(full, label)
+        if initial:
+            self._initial_all.setdefault(initial, set()).add(label)
+            if not full:
+                self._initial_abbrev.setdefault(initial, set()).add(label)
+
+        if "," not in label and len(given) == 1 and len(given[0]) > 1 and " " not in family and len(family) > 1:
+            # Two-token names also match with the order swapped ("Zhang Wei" / "Wei Zhang"),
+            # by full name only: an initial of the swapped order ("Z. Wei") is someone else.
+            self._full.setdefault(f"{family} {given[0]}", label)
+
+    def add_affiliation(self, label: str) -> None:
+        key = normalize_text(label)
+        if not key:
+            logger.warning(f"Ignoring watchlist affiliation {label!r}: nothing left after normalization.")
+            return
+        self._affiliations.setdefault(key, label)
+        self._max_affiliation_tokens = max(self._max_affiliation_tokens, len(key.split()))
+
+    def match_author(self, name: str) -> List[str]:
+        given, family = split_name(name)
+        if not given:
+            return [self._mononyms[family]] if family in self._mononyms else []
+        full, initial = _keys(given, family)
+        if full and full in self._full:
+            return [self._full[full]]
+        if not initial:
+            return []
+        if not full:
+            # Paper lists an abbreviated name: any watched name with that initial + family.
+            return sorted(self._initial_all.get(initial, ()))
+        # Paper lists a full name: only watchlist entries that were themselves abbreviated.
+        return sorted(self._initial_abbrev.get(initial, ()))
+
+    def match_affiliation(self, affiliation: str) -> List[str]:
+        tokens = normalize_text(affiliation).split()
+        hits = []
+        for size in range(1, min(self._max_affiliation_tokens, len(tokens)) + 1):
+            for start in range(len(tokens) - size + 1):
+                label = self._affiliations.get(" ".join(tokens[start:start + size]))
+                if label and label not in hits:
+                    hits.append(label)
+        return hits
+
+    def match(self, authors: Iterable[Any]) -> List[str]:
+        """
+        Watchlist labels hit by a paper's authors.
+
+        `authors` may hold plain names or objects with `.name` (and optionally
+        `.affiliation`), such as `arxiv.Result.Author` or `FeedAuthor`.
+        """
+        if not self:
+            return []
+
+        hits: List[str] = []
+        for author in authors:
+            name = author if isinstance(author, str) else getattr(author, "name", "")
+            found = self.match_author(name) if isinstance(name, str) else []
+            affiliation = getattr(author, "affiliation", None)
+            if isinstance(affiliation, str) and self._affiliations:
+                found = found + self.match_affiliation(affiliation)
+            for label in found:
+                if label not in hits:
+                    hits.append(label)
+        return hits
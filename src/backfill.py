@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import logging
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Ensure src is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from arxiv_client import ArxivClient
+from llm_processor import LLMProcessor
+from batch_processor import BatchSummarizer
+from paper_store import PaperStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    batch_config = (settings.llm_config.get("batch") or {}) if settings else {}
+    parser = argparse.ArgumentParser(description="Summarize stored papers offline via the Batch API.")
+    parser.add_argument("--store", required=True, help="Paper store JSON file (mapping or list of papers).")
+    parser.add_argument("--since", type=_parse_date,
+                        help="Fetch papers submitted on or after this date (YYYY-MM-DD, UTC) into the store first.")
+    parser.add_argument("--until", type=_parse_date,
+                        help="Last submission date to fetch, inclusive (default: today).")
+    parser.add_argument("--max-results", type=int, default=2000, help="Upper bound on papers fetched for the range.")
+    parser.add_argument("--checkpoint", help="Batch checkpoint file (default: <store>.batches.json).")
+    parser.add_argument("--poll-interval", type=float, default=float(batch_config.get("poll_interval", 60)))
+    parser.add_argument("--max-requests", type=int, default=int(batch_config.get("max_requests", 5000)))
+    parser.add_argument("--completion-window", default=batch_config.get("completion_window", "24h"))
+    parser.add_argument("--max-attempts", type=int, default=int(batch_config.get("max_attempts", 3)),
+                        help="Batch requests per paper, including field repairs.")
+    return parser.parse_args(argv)
+
+
+def _parse_date(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+async def backfill(argv=None) -> int:
+    if not settings:
+        logger.error("Configuration failed. Exiting.")
+        sys.exit(1)
+
+    args = parse_args(argv)
+    store = PaperStore(args.store)
+    if args.since:
+        until = args.until or datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        papers = ArxivClient().fetch_papers_between(args.since, until + timedelta(days=1), max_results=args.max_results)
+        store.upsert(papers)
+        store.save()
+    logger.info(f"Loaded {len(store.papers)} papers, {len(store.unsummarized())} without summary.")
+
+    processor = LLMProcessor()
+    summarizer = BatchSummarizer(
+        processor,
+        checkpoint_path=args.checkpoint or args.store + ".batches.json",
+        poll_interval=args.poll_interval,
+        max_requests=args.max_requests,
+        completion_window=args.completion_window,
+        max_attempts=args.max_attempts,
+    )
+    try:
+        return await summarizer.run(store)
+    finally:
+        await processor.aclose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(backfill())
+    except KeyboardInterrupt:
+        logger.info("Backfill interrupted; rerun to resume from the checkpoint.")
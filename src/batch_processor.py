@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import List, Dict, Any, Optional
+from paper_store import PaperStore
+from summary_parser import StructuredSummary, parse_summary
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchSummarizer:
+    """
+    Summarizes papers offline through an OpenAI-compatible Batch API.
+
+    Meant for backfills: instead of one synchronous chat call per paper, requests
+    built from `LLMProcessor.build_prompt` are written to JSONL, uploaded and
+    submitted as batches, polled until done, and merged back into a `PaperStore`
+    by entry_id. Submitted batches are checkpointed to `checkpoint_path`, so an
+    interrupted backfill resumes polling instead of resubmitting (and paying for)
+    the same requests.
+
+    Results with a few missing fields keep what parsed; the next batch carries a
+    field-level repair request for them (`LLMProcessor.build_repair_prompt`), so
+    repairs also get the batch price. Requests per entry_id are counted in the
+    checkpoint and capped at `max_attempts`; the last attempt's result is kept
+    whatever its state, so nothing is re-billed indefinitely.
+    """
+
+    def __init__(
+        self,
+        processor,
+        checkpoint_path: str,
+        poll_interval: float = 60.0,
+        max_requests: int = 5000,
+        completion_window: str = "24h",
+        max_attempts: int = 3,
+    ):
+        self.processor = processor
+        self.checkpoint_path = checkpoint_path
+        self.poll_interval = poll_interval
+        self.max_requests = max(1, max_requests)
+        self.completion_window = completion_window
+        self.max_attempts = max(1, max_attempts)
+
+    async def run(self, store: PaperStore) -> int:
+        """
+        Submit every unsummarized paper in `store` and merge the results.
+        Returns the number of papers that received a summary.
+        """
+        if not self.processor.client:
+            logger.error("LLM client not configured. Cannot run batch summarization.")
+            return 0
+
+        checkpoint = self._load_checkpoint()
+        open_batches = [b for b in checkpoint["batches"] if not b.get("done")]
+        in_flight = {entry_id for b in open_batches for entry_id in b["entry_ids"]}
+        if open_batches:
+            logger.info(f"Resuming {len(open_batches)} submitted batch(es) from checkpoint.")
+
+        attempts = checkpoint["attempts"]
+        todo = [p for p in store.unsummarized() if p["entry_id"] not in in_flight]
+        exhausted = [p for p in todo if attempts.get(p["entry_id"], 0) >= self.max_attempts]
+        if exhausted:
+            logger.warning(f"Skipping {len(exhausted)} paper(s) that already used {self.max_attempts} batch attempts.")
+            todo = [p for p in todo if attempts.get(p["entry_id"], 0) < self.max_attempts]
+
+        for i in range(0, len(todo), self.max_requests):
+            record = await self._submit(todo[i:i + self.max_requests])
+            checkpoint["batches"].append(record)
+            for entry_id in record["entry_ids"]:
+                attempts[entry_id] = attempts.get(entry_id, 0) + 1
+            self._save_checkpoint(checkpoint)
+            open_batches.append(record)
+
+        merged = 0
+        for record in open_batches:
+            batch = await self._wait(record, checkpoint)
+            if batch.status == "completed" and batch.output_file_id:
+                merged += await self._merge(batch.output_file_id, store, attempts)
+            else:
+                # Papers stay unsummarized and are picked up by the next run.
+                logger.error(f"Batch {record['batch_id']} ended with status {batch.status}; nothing merged.")
+            record["done"] = True
+            store.save()
+            self._save_checkpoint(checkpoint)
+
+        logger.info(f"Batch summarization merged {merged} summaries.")
+        logger.info(f"LLM token usage: {self.processor.usage_stats()}")
+        return merged
+
+    def write_requests(self, papers: List[Dict[str, Any]], path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for paper in papers:
+                # Papers holding a partial summary from an earlier batch only ask for what is missing.
+                partial = StructuredSummary(fields=dict(paper.get("ai_summary_fields") or {}))
+                if partial.fields:
+                    prompt = self.processor.build_repair_prompt(paper, partial.missing)
+                else:
+                    prompt = self.processor.build_prompt(paper)
+                line = {
+                    "custom_id": paper["entry_id"],
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self.processor.completion_params(prompt),
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    async def _submit(self, papers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        input_path = os.path.join(directory, f"batch-input-{int(time.time() * 1000)}.jsonl")
+        self.write_requests(papers, input_path)
+
+        client = self.processor.client
+        with open(input_path, "rb") as f:
+            uploaded = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(papers)} requests.")
+        return {
+            "batch_id": batch.id,
+            "input_file_id": uploaded.id,
+            "input_path": input_path,
+            "entry_ids": [p["entry_id"] for p in papers],
+            "status": batch.status,
+            "done": False,
+        }
+
+    async def _wait(self, record: Dict[str, Any], checkpoint: Dict[str, Any]):
+        while True:
+            batch = await self.processor.client.batches.retrieve(record["batch_id"])
+            if batch.status != record.get("status"):
+                logger.info(f"Batch {batch.id}: {record.get('status')} -> {batch.status}")
+                record["status"] = batch.status
+                self._save_checkpoint(checkpoint)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            await asyncio.sleep(self.poll_interval)
+
+    async def _merge(self, output_file_id: str, store: PaperStore, attempts: Dict[str, int]) -> int:
+        output = await self.processor.client.files.content(output_file_id)
+        merged = repairs = 0
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            paper = store.get(result.get("custom_id"))
+            content = self._extract_content(result)
+            self.processor.record_usage(((result.get("response") or {}).get("body") or {}).get("usage"))
+            if paper is None or content is None:
+                logger.warning(f"Skipping batch result for {result.get('custom_id')}: {result.get('error')}")
+                continue
+
+            # No synchronous repair calls here: that would forfeit the batch discount.
+            partial = StructuredSummary(fields=dict(paper.get("ai_summary_fields") or {}))
+            summary = partial.merge(parse_summary(content))
+            if self.processor.needs_repair(summary) and attempts.get(paper["entry_id"], 0) < self.max_attempts:
+                paper["ai_summary_fields"] = dict(summary.fields)
+                repairs += 1
+                continue
+            self.processor.apply_summary(paper, summary, content)
+            merged += 1
+        if repairs:
+            logger.info(f"{repairs} batch result(s) are missing fields; rerun to submit repair requests.")
+        return merged
+
+    def _extract_content(self, result: Dict[str, Any]) -> Optional[str]:
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            return None
+        try:
+            return response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if not os.path.exists(self.checkpoint_path):
+            return {"batches": [], "attempts": {}}
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        checkpoint.setdefault("attempts", {})
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, indent=1)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -51,14 +51,78 @@ class Config:
     def match_logic(self) -> str:
         return self.criteria.get("match_logic", "OR").upper()
 
+    @property
+    def watchlist(self) -> Dict[str, Any]:
+        return self.criteria.get("watchlist") or {}
+
+    @property
+    def watchlist_authors(self) -> List[str]:
+        return self.watchlist.get("authors") or []
+
+    @property
+    def watchlist_affiliations(self) -> List[str]:
+        return self.watchlist.get("affiliations") or []
+
+    @property
+    def watchlist_weight(self) -> int:
+        return int(self.watchlist.get("weight", 5))
+
+    @property
+    def arxiv_config(self) -> Dict[str, Any]:
+        return self._config.get("arxiv") or {}
+
+    @property
+    def fetch_backend(self) -> str:
+        return str(self.arxiv_config.get("backend", "library")).lower()
+
+    @property
+    def arxiv_api_url(self) -> Optional[str]:
+        return self.arxiv_config.get("api_url")
+
+    @property
+    def fetch_source(self) -> str:
+        return str(self.arxiv_config.get("source", "search")).lower()
+
+    @property
+    def arxiv_listing_url(self) -> Optional[str]:
+        return self.arxiv_config.get("listing_url")
+
+    @property
+    def announce_types(self) -> List[str]:
+        return self.arxiv_config.get("announce_types", ["new", "cross"])
+
+    @property
+    def arxiv_cache_dir(self) -> Optional[str]:
+        return self._resolve_path(self.arxiv_config.get("cache_dir"))
+
+    @property
+    def state_dir(self) -> Optional[str]:
+        return self._resolve_path(self._config.get("state_dir"))
+
     @property
     def llm_config(self) -> Dict[str, Any]:
         return self._config.get("llm", {})
 
+    @property
+    def llm_language(self) -> str:
+        return self.llm_config.get("language", "zh-CN")
+
+    @property
+    def translation_cache_dir(self) -> Optional[str]:
+        return self._resolve_path(self.llm_config.get("translation_cache_dir"))
+
     @property
     def email_config(self) -> Dict[str, Any]:
         return self._config.get("email", {})
 
+    def _resolve_path(self, path: Optional[str]) -> Optional[str]:
+        """Resolve a configured path relative to the directory holding config.yaml."""
+        if not path:
+            return None
+        if os.path.isabs(path):
+            return path
+        return os.path.join(os.path.dirname(os.path.abspath(self.config_path)), path)
+
     # Environment variable getters
     @property
     def mail_user(self) -> str:
@@ -93,6 +157,30 @@ class Config:
 
         return []
 
+    @property
+    def recipients_by_language(self) -> Dict[str, List[str]]:
+        """
+        Recipients grouped by digest language.
+
+        `email.recipients_by_language` assigns addresses to languages; every other
+        recipient gets the canonical `llm.language` digest.
+        """
+        groups: Dict[str, List[str]] = {}
+        assigned = set()
+        configured = self.email_config.get("recipients_by_language") or {}
+        for language, addrs in configured.items():
+            if isinstance(addrs, str):
+                addrs = addrs.replace(";", ",").split(",")
+            clean = [str(s).strip() for s in addrs or [] if str(s).strip()]
+            if clean:
+                groups.setdefault(str(language), []).extend(clean)
+                assigned.update(clean)
+
+        rest = [r for r in self.mail_recipients if r not in assigned]
+        if rest:
+            groups = {self.llm_language: rest + groups.pop(self.llm_language, []), **groups}
+        return groups
+
     @property
     def llm_api_key(self) -> str:
         return os.getenv("LLM_API_KEY", "").strip()
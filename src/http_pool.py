@@ -0,0 +1,123 @@
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+
+try:
+    # openai>=3 is built on httpx2; older releases use httpx. Both expose the same API.
+    import httpx2 as httpx
+except ImportError:  # pragma: no cover - depends on the installed openai release
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolMetrics:
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+    connect_seconds: float = 0.0
+    tls_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["connect_seconds"] = round(self.connect_seconds, 3)
+        data["tls_seconds"] = round(self.tls_seconds, 3)
+        # Share of requests served over an already-open connection.
+        data["reuse_ratio"] = round(1 - self.connections_opened / self.requests, 3) if self.requests else 0.0
+        return data
+
+
+class MeteredTransport(httpx.AsyncHTTPTransport):
+    """
+    `AsyncHTTPTransport` that counts new connections and their setup time.
+
+    Uses the transport's per-request `trace` extension, so the numbers reflect
+    what the pool actually did rather than what we expect it to do.
+    """
+
+    def __init__(self, metrics: PoolMetrics, **kwargs):
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    async def handle_async_request(self, request):
+        self.metrics.requests += 1
+        started: Dict[str, float] = {}
+        upstream = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name.endswith(".started"):
+                started[event_name[:-len(".started")]] = time.perf_counter()
+            elif event_name.endswith("connect_tcp.complete"):
+                self.metrics.connections_opened += 1
+                self.metrics.connect_seconds += time.perf_counter() - started.get(event_name[:-len(".complete")], time.perf_counter())
+            elif event_name.endswith("start_tls.complete"):
+                self.metrics.tls_handshakes += 1
+                self.metrics.tls_seconds += time.perf_counter() - started.get(event_name[:-len(".complete")], time.perf_counter())
+            if upstream is not None:
+                await upstream(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        return await super().handle_async_request(request)
+
+    def pool_state(self) -> Dict[str, int]:
+        # Best effort: `connections` is httpcore's, not part of httpx's API.
+        connections = getattr(getattr(self, "_pool", None), "connections", None)
+        if connections is None:
+            return {}
+        return {
+            "open": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+        }
+
+
+class LLMHttpPool:
+    """
+    One tuned HTTP connection pool shared by every LLM client of a run.
+
+    `LLMProcessor` hands `client` to each `AsyncOpenAI` it creates (including
+    the alternate-base-url fallback), so pooled keep-alive connections and TLS
+    sessions survive client swaps. Pool size follows the request concurrency.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, concurrency: int = 5):
+        config = config or {}
+        self.metrics = PoolMetrics()
+
+        http2 = bool(config.get("http2", True))
+        if http2 and not _h2_available():
+            logger.info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1.")
+            http2 = False
+
+        max_connections = int(config.get("max_connections", concurrency))
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=int(config.get("max_keepalive_connections", max_connections)),
+            keepalive_expiry=float(config.get("keepalive_expiry", 30.0)),
+        )
+        read_timeout = float(config.get("read_timeout", 30.0))
+        self.timeout = httpx.Timeout(
+            read_timeout,
+            connect=float(config.get("connect_timeout", 5.0)),
+            write=float(config.get("write_timeout", 10.0)),
+            pool=float(config.get("pool_timeout", read_timeout)),
+        )
+        self.limits = limits
+        self.transport = MeteredTransport(self.metrics, http2=http2, limits=limits)
+        self.client = httpx.AsyncClient(transport=self.transport, timeout=self.timeout, follow_redirects=True)
+        self.http2 = http2
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.metrics.snapshot(), **self.transport.pool_state(), "http2": self.http2}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
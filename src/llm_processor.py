@@ -1,12 +1,18 @@
 import asyncio
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from openai import AsyncOpenAI
 from config import settings
+from summary_parser import FIELD_LABELS, StructuredSummary, parse_summary
+from http_pool import LLMHttpPool
+from prompt_input import TokenCounter, normalize_abstract
 
 logger = logging.getLogger(__name__)
 
+# A repair asking for more fields than this is effectively a regeneration; skip it.
+MAX_REPAIR_FIELDS = 3
+
 class LLMProcessor:
     def __init__(self):
         if not settings or not settings.llm_config.get("enable"):
@@ -19,12 +25,23 @@ class LLMProcessor:
         self._tried_alt_base_url = False
         self._disabled = False
 
-        self.client = AsyncOpenAI(api_key=settings.llm_api_key, base_url=self._base_url)
+        # Pool size follows the semaphore so requests never queue for a connection.
+        concurrency = int(settings.llm_config.get("concurrency", 5))
+        self.http_pool = LLMHttpPool(settings.llm_config.get("http"), concurrency=concurrency)
+        self.client = self._make_client(self._base_url)
 
         env_model = os.getenv("LLM_MODEL", "").strip()
         self.model = env_model or settings.llm_config.get("model", "gpt-3.5-turbo")
         self.language = settings.llm_config.get("language", "zh-CN")
-        self.semaphore = asyncio.Semaphore(5)
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        # Instructions are identical for every paper, so they go first as the system
+        # message; providers cache that shared prefix across requests.
+        self.system_prompt = self._build_system_prompt()
+        self.tokenizer = TokenCounter(settings.llm_config.get("tokenizer", "o200k_base"))
+        self.max_input_tokens = int(settings.llm_config.get("max_input_tokens", 1024))
+        self.usage = {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+        self._truncated = set()
 
     async def summarize_paper(self, paper: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -37,23 +54,12 @@ class LLMProcessor:
 
         # If summary already exists (e.g. from cache? not implementing cache yet), return.
         
-        prompt = self._build_prompt(paper)
+        prompt = self.build_prompt(paper)
         
         try:
-            async with self.semaphore:
-                response = await self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a helpful research assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    timeout=30
-                )
-                
-                content = response.choices[0].message.content
-                paper["ai_summary"] = content
-                logger.info(f"Successfully summarized: {paper['title'][:30]}...")
+            content = await self.complete(prompt)
+            await self._store_summary(paper, content)
+            logger.info(f"Successfully summarized: {paper['title'][:30]}...")
                 
         except Exception as e:
             if self._is_model_not_exist_error(e):
@@ -61,19 +67,9 @@ class LLMProcessor:
                     self._tried_alt_base_url = True
                     logger.warning(f"LLM model error detected; retrying with base_url={self._alt_base_url}")
                     try:
-                        self.client = AsyncOpenAI(api_key=settings.llm_api_key, base_url=self._alt_base_url)
-                        async with self.semaphore:
-                            response = await self.client.chat.completions.create(
-                                model=self.model,
-                                messages=[
-                                    {"role": "system", "content": "You are a helpful research assistant."},
-                                    {"role": "user", "content": prompt}
-                                ],
-                                temperature=0.3,
-                                timeout=30
-                            )
-                        content = response.choices[0].message.content
-                        paper["ai_summary"] = content
+                        self.client = self._make_client(self._alt_base_url)
+                        content = await self.complete(prompt)
+                        await self._store_summary(paper, content)
                         return paper
                     except Exception as e2:
                         logger.error(f"LLM retry failed: {type(e2).__name__}: {e2}")
@@ -88,7 +84,90 @@ class LLMProcessor:
 
         return paper
 
-    def _build_prompt(self, paper: Dict[str, Any]) -> str:
+    async def complete(self, prompt: str, system: Optional[str] = None) -> str:
+        """One chat completion under the concurrency limit; `system` defaults to the summary instructions."""
+        async with self.semaphore:
+            response = await self.client.chat.completions.create(**self.completion_params(prompt, system))
+        self.record_usage(getattr(response, "usage", None))
+        return response.choices[0].message.content
+
+    def completion_params(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Chat completion request body; shared with the offline batch mode."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system or self.system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+        }
+
+    def record_usage(self, usage: Any) -> None:
+        """
+        Add one response's token usage to the run totals.
+
+        Accepts the SDK object or the plain dict found in batch output. Cached
+        prompt tokens are read from `prompt_tokens_details.cached_tokens` (OpenAI)
+        or `prompt_cache_hit_tokens` (DeepSeek); providers reporting neither count as 0.
+        """
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+        details = usage.get("prompt_tokens_details") or {}
+        if not isinstance(details, dict):
+            details = vars(details)
+
+        self.usage["requests"] += 1
+        self.usage["prompt_tokens"] += int(usage.get("prompt_tokens") or 0)
+        self.usage["completion_tokens"] += int(usage.get("completion_tokens") or 0)
+        self.usage["cached_tokens"] += int(details.get("cached_tokens") or usage.get("prompt_cache_hit_tokens") or 0)
+
+    def usage_stats(self) -> Dict[str, Any]:
+        stats = {**self.usage, "truncated": len(self._truncated)}
+        prompt_tokens = stats["prompt_tokens"]
+        stats["cache_hit_ratio"] = round(stats["cached_tokens"] / prompt_tokens, 3) if prompt_tokens else 0.0
+        return stats
+
+    async def _store_summary(self, paper: Dict[str, Any], content: str) -> None:
+        """
+        Parse the response into structured fields and patch up missing ones.
+
+        Fields the model skipped or garbled are requested in one small follow-up
+        call instead of regenerating the whole summary, but only when most of the
+        summary parsed (at most `MAX_REPAIR_FIELDS` missing).
+        """
+        summary = parse_summary(content)
+        if self.needs_repair(summary):
+            logger.info(f"Summary for '{paper['title'][:30]}...' missing fields {summary.missing}; requesting repair")
+            try:
+                repair = await self.complete(self.build_repair_prompt(paper, summary.missing))
+                summary = summary.merge(parse_summary(repair))
+            except Exception as e:
+                logger.warning(f"Summary repair failed: {type(e).__name__}: {e}")
+        elif summary.missing:
+            logger.info(f"Summary for '{paper['title'][:30]}...' missing {len(summary.missing)} fields; keeping the raw text")
+
+        self.apply_summary(paper, summary, content)
+
+    def needs_repair(self, summary: StructuredSummary) -> bool:
+        """True when a few fields are missing, so a field-level repair is worth asking for."""
+        return bool(summary.missing) and len(summary.missing) <= MAX_REPAIR_FIELDS
+
+    def apply_summary(self, paper: Dict[str, Any], summary: StructuredSummary, content: str) -> None:
+        """
+        Store the summary on `paper`: structured when at most `MAX_REPAIR_FIELDS`
+        fields are missing, otherwise the raw `content`, so a reply in a format
+        the parser does not know is shown whole rather than cut down to a few fields.
+        """
+        if summary.fields and len(summary.missing) <= MAX_REPAIR_FIELDS:
+            paper["ai_summary"] = summary.to_text()
+            paper["ai_summary_fields"] = dict(summary.fields)
+        else:
+            paper["ai_summary"] = content
+            paper["ai_summary_fields"] = None
+
+    def _build_system_prompt(self) -> str:
         return f"""你是严谨的论文解读助手。请仅基于标题与摘要，不要编造不存在的实验结果、数据、方法细节或结论；不确定请明确写“摘要未提供/不确定”。输出语言：{self.language}。
 
 输出要求：
@@ -104,20 +183,77 @@ class LLMProcessor:
 【结论/效果】…（没有量化指标就写“摘要未给出量化结果”）
 【局限与风险】…（至少 1 点）
 【适用场景】…（1~2 个）
-【关键词】…（3~6 个，用逗号分隔）
+【关键词】…（3~6 个，用逗号分隔）"""
+
+    def build_prompt(self, paper: Dict[str, Any]) -> str:
+        """User message for one paper; the instructions live in `system_prompt`."""
+        return f"""论文标题：{normalize_abstract(paper['title'])}
+论文摘要：{self._prepare_abstract(paper)}"""
 
-论文标题：{paper['title']}
-论文摘要：{paper['summary']}"""
+    def _prepare_abstract(self, paper: Dict[str, Any]) -> str:
+        """Normalized abstract, cut to `llm.max_input_tokens` (0 disables the limit)."""
+        abstract = normalize_abstract(paper.get("summary"))
+        truncated = self.tokenizer.truncate(abstract, self.max_input_tokens)
+        key = paper.get("entry_id") or paper["title"]
+        if truncated != abstract and key not in self._truncated:
+            self._truncated.add(key)
+            logger.info(f"Abstract of '{paper['title'][:30]}...' truncated to {self.max_input_tokens} tokens")
+        return truncated
 
-    async def process_papers(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def build_repair_prompt(self, paper: Dict[str, Any], missing: List[str]) -> str:
+        # Sent with the same system prompt, so only the field list and paper vary.
+        hints = {
+            "method": "（尽量用“输入→处理→输出”的方式表述）",
+            "contributions": "（1~3 点，逗号分隔）",
+            "results": "（没有量化指标就写“摘要未给出量化结果”）",
+            "limitations": "（至少 1 点）",
+            "use_cases": "（1~2 个）",
+            "keywords": "（3~6 个，用逗号分隔）",
+        }
+        lines = "\n".join(f"【{FIELD_LABELS[key]}】…{hints.get(key, '')}" for key in missing)
+        return f"""本次只补全下列字段（每项一行，字段名保持一致，不要输出其他字段）：
+{lines}
+
+{self.build_prompt(paper)}"""
+
+    async def process_papers(
+        self,
+        papers: List[Dict[str, Any]],
+        on_summarized: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Process a list of papers concurrently.
+
+        `on_summarized` is called with each paper as soon as its summary is done,
+        e.g. to checkpoint progress before the whole batch finishes.
         """
         if not self.client:
             return papers
 
-        tasks = [self.summarize_paper(paper) for paper in papers]
-        return await asyncio.gather(*tasks)
+        async def summarize(paper):
+            paper = await self.summarize_paper(paper)
+            if on_summarized:
+                on_summarized(paper)
+            return paper
+
+        tasks = [summarize(paper) for paper in papers]
+        results = await asyncio.gather(*tasks)
+        logger.info(f"LLM HTTP pool stats: {self.http_pool.stats()}")
+        logger.info(f"LLM token usage: {self.usage_stats()}")
+        return results
+
+    async def aclose(self):
+        if self.client:
+            await self.http_pool.aclose()
+
+    def _make_client(self, base_url: str) -> AsyncOpenAI:
+        # Timeouts live on the shared pool (separate connect/read), not per call.
+        return AsyncOpenAI(
+            api_key=settings.llm_api_key,
+            base_url=base_url,
+            http_client=self.http_pool.client,
+            timeout=self.http_pool.timeout,
+        )
 
     def _derive_alt_base_url(self, base_url: str) -> Optional[str]:
         if not base_url:
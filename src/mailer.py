@@ -1,3 +1,4 @@
+import hashlib
 import smtplib
 import logging
 import os
@@ -6,8 +7,10 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from config import settings
+from run_journal import RunJournal
+from summary_parser import FIELD_KEYS, StructuredSummary, labels_for
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,8 @@ class Mailer:
         self.user = settings.mail_user
         self.password = settings.mail_pass
         self.recipients = settings.mail_recipients
+        self.recipient_groups = settings.recipients_by_language
+        self.default_language = settings.llm_language
 
         env_host = os.getenv("SMTP_HOST", "").strip()
         env_port = os.getenv("SMTP_PORT", "").strip()
@@ -30,93 +35,162 @@ class Mailer:
         template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
         self.env = Environment(loader=FileSystemLoader(template_dir))
 
-    def send_daily_digest(self, papers: List[Dict[str, Any]]):
+    def send_daily_digest(self, papers: List[Dict[str, Any]], journal: Optional[RunJournal] = None) -> bool:
+        """
+        Send the digest to every recipient, one message each.
+
+        Each language group shares one SMTP session.
+
+        With a `journal`, recipients already delivered for this run are skipped and
+        each successful delivery is recorded, so a retried run never double-sends.
+        Returns True when every recipient has the digest (now or from an earlier attempt).
+        """
         if not papers and not settings.email_config.get("send_empty", False):
             logger.info("No papers to send and send_empty is False. Skipping email.")
-            return
+            return True
 
         if not self.user or not self.password:
             logger.error("Mail credentials not found. Skipping email.")
-            return
-        if not self.recipients:
+            return False
+        if not self.recipient_groups:
             logger.error("Mail recipients not found. Skipping email.")
-            return
+            return False
+
+        subject_prefix = settings.email_config.get("subject_prefix", "[ArXiv Daily]")
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        subject = f"{subject_prefix} {date_str} Update: {len(papers)} Papers Found"
+
+        all_sent = True
+        # One rendering per digest language, each sent to that language's recipients.
+        for language, recipients in self.recipient_groups.items():
+            pending = [r for r in recipients if not journal or r not in journal.delivered]
+            if len(pending) < len(recipients):
+                logger.info(f"Skipping {len(recipients) - len(pending)} recipient(s) already delivered for this run.")
+            if not pending:
+                continue
+
+            try:
+                # Render HTML
+                template = self.env.get_template('email_template.html')
+                html_content = template.render(
+                    papers=self._localize(papers, language),
+                    summary_fields=self._summary_fields(language),
+                    language=language,
+                    subject_prefix=subject_prefix,
+                    date_str=date_str
+                )
+            except Exception as e:
+                logger.error(f"Failed to render email ({language}): {type(e).__name__}: {e}")
+                all_sent = False
+                continue
+
+            # One SMTP session per group: providers such as QQ/Foxmail throttle repeated logins.
+            try:
+                logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
+                server = self._open_smtp()
+            except Exception as e:
+                logger.error(f"Failed to send email ({language}): {type(e).__name__}: {e}")
+                all_sent = False
+                continue
 
+            try:
+                for recipient in pending:
+                    msg = MIMEMultipart()
+                    msg['From'] = self.user
+                    msg['To'] = recipient
+                    msg['Subject'] = subject
+                    # Stable per (run date, recipient), so a resend that slips through is recognisable.
+                    msg['Message-ID'] = self._digest_message_id(date_str, recipient)
+                    msg.attach(MIMEText(html_content, 'html'))
+
+                    try:
+                        try:
+                            server.send_message(msg, to_addrs=[recipient])
+                        except smtplib.SMTPServerDisconnected:
+                            # The server dropped an idle or long session; log in again once.
+                            logger.warning("SMTP session closed by server; reconnecting.")
+                            self._close_smtp(server)
+                            server = self._open_smtp()
+                            server.send_message(msg, to_addrs=[recipient])
+                        if journal:
+                            journal.record_delivered(recipient)
+                        logger.info(f"Email ({language}) sent successfully to {recipient}")
+                    except Exception as e:
+                        all_sent = False
+                        logger.error(f"Failed to send email ({language}) to {recipient}: {type(e).__name__}: {e}")
+            finally:
+                self._close_smtp(server)
+
+        return all_sent
+
+    def _digest_message_id(self, date_str: str, recipient: str) -> str:
+        digest = hashlib.sha1(f"{date_str}:{recipient}".encode("utf-8")).hexdigest()[:16]
+        domain = self.user.split("@", 1)[1] if "@" in self.user else "localhost"
+        return f"<arxiv-digest-{date_str}-{digest}@{domain}>"
+
+    def _localize(self, papers: List[Dict[str, Any]], language: str) -> List[Dict[str, Any]]:
+        """
+        Shallow copies of `papers` whose summary fields are in `language`.
+
+        Papers without a translation keep the canonical summary.
+        """
+        if language == self.default_language:
+            return papers
+
+        localized = []
+        for paper in papers:
+            fields = (paper.get("ai_summary_i18n") or {}).get(language)
+            if fields:
+                paper = dict(paper)
+                paper["ai_summary_fields"] = fields
+                paper["ai_summary"] = StructuredSummary(fields=dict(fields)).to_text(labels_for(language))
+            localized.append(paper)
+        return localized
+
+    def _summary_fields(self, language: str) -> List[tuple]:
+        labels = labels_for(language)
+        return [(key, labels[key]) for key in FIELD_KEYS]
+
+    def _send_message(self, msg: MIMEMultipart, recipients: Optional[List[str]] = None):
+        server = self._open_smtp()
         try:
-            subject_prefix = settings.email_config.get("subject_prefix", "[ArXiv Daily]")
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            subject = f"{subject_prefix} {date_str} Update: {len(papers)} Papers Found"
-
-            # Render HTML
-            template = self.env.get_template('email_template.html')
-            html_content = template.render(
-                papers=papers,
-                subject_prefix=subject_prefix,
-                date_str=date_str
-            )
-
-            # Create Message
-            msg = MIMEMultipart()
-            msg['From'] = self.user
-            msg['To'] = ", ".join(self.recipients)
-            msg['Subject'] = subject
-            msg.attach(MIMEText(html_content, 'html'))
-
-            # Send
-            logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
-            self._send_message(msg)
-            
-            logger.info(f"Email sent successfully to {', '.join(self.recipients)}")
-
-        except Exception as e:
-            logger.error(f"Failed to send email: {type(e).__name__}: {e}")
-
-    def _send_message(self, msg: MIMEMultipart):
-        host = self.smtp_host
-        port = self.smtp_port
-        send_to = self.recipients
+            server.send_message(msg, to_addrs=recipients or self.recipients)
+        finally:
+            self._close_smtp(server)
 
+    def _open_smtp(self):
+        """Connect and log in, walking the SSL/STARTTLS fallbacks; returns the live session."""
         tried = []
-        for attempt_host, attempt_port, attempt_mode in self._iter_smtp_fallbacks(host, port):
+        for attempt_host, attempt_port, attempt_mode in self._iter_smtp_fallbacks(self.smtp_host, self.smtp_port):
             tried.append(f"{attempt_host}:{attempt_port}/{attempt_mode}")
+            server = None
             try:
                 if attempt_mode == "ssl":
                     server = smtplib.SMTP_SSL(attempt_host, attempt_port, timeout=20)
-                    try:
-                        server.login(self.user, self.password)
-                        server.send_message(msg, to_addrs=send_to)
-                        return
-                    finally:
-                        try:
-                            server.quit()
-                        except Exception:
-                            try:
-                                server.close()
-                            except Exception:
-                                pass
                 else:
                     server = smtplib.SMTP(attempt_host, attempt_port, timeout=20)
-                    try:
-                        server.ehlo()
-                        server.starttls(context=ssl.create_default_context())
-                        server.ehlo()
-                        server.login(self.user, self.password)
-                        server.send_message(msg, to_addrs=send_to)
-                        return
-                    finally:
-                        try:
-                            server.quit()
-                        except Exception:
-                            try:
-                                server.close()
-                            except Exception:
-                                pass
+                    server.ehlo()
+                    server.starttls(context=ssl.create_default_context())
+                    server.ehlo()
+                server.login(self.user, self.password)
+                return server
             except Exception as e:
+                if server is not None:
+                    self._close_smtp(server)
                 logger.warning(f"SMTP attempt failed {attempt_host}:{attempt_port}/{attempt_mode}: {type(e).__name__}: {e}")
                 continue
 
         raise RuntimeError(f"All SMTP attempts failed: {', '.join(tried)}")
 
+    def _close_smtp(self, server) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
     def _infer_smtp_settings(self, email_addr: str) -> tuple[str, int]:
         domain = ""
         if "@" in email_addr:
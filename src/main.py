@@ -2,14 +2,17 @@ import asyncio
 import logging
 import sys
 import os
+from datetime import datetime, timezone
 
 # Ensure src is in python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import settings
-from arxiv_client import ArxivClient
+from arxiv_client import ArxivClient, ArxivFetchError
 from llm_processor import LLMProcessor
+from translator import SummaryTranslator
 from mailer import Mailer
+from run_journal import RunJournal
 
 # Configure Logging
 logging.basicConfig(
@@ -30,16 +33,36 @@ async def main():
 
     dry_run = os.getenv("DRY_RUN", "").strip().lower() in {"1", "true", "yes", "y"}
 
+    # Completed stages of today's run are journaled so a retry resumes where the last attempt stopped.
+    run_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    journal = RunJournal.for_date(None if dry_run else settings.state_dir, run_date)
+    if journal.completed:
+        logger.info(f"Run for {run_date} already completed. Nothing to do.")
+        return
+
     # 1. Fetch Papers
-    client = ArxivClient()
-    papers = client.fetch_papers()
+    if journal.resumed:
+        papers = journal.papers
+        logger.info(f"Resuming run for {run_date}: {len(papers)} papers from journal, skipping fetch.")
+    else:
+        client = ArxivClient()
+        try:
+            papers = client.fetch_papers()
+        except ArxivFetchError:
+            # Nothing is journaled, so a rerun fetches again.
+            logger.error("Fetching from ArXiv failed; rerun to retry.")
+            sys.exit(1)
+        journal.record_fetched(papers)
 
     if not papers:
         logger.info("No papers found matching the criteria.")
         # Optional: Send empty email if configured
         if settings.email_config.get("send_empty", False) and not dry_run:
             mailer = Mailer()
-            mailer.send_daily_digest([])
+            if not mailer.send_daily_digest([], journal=journal):
+                logger.error("Some deliveries failed; rerun to retry only the remaining recipients.")
+                sys.exit(1)
+        journal.record_completed()
         return
 
     if dry_run:
@@ -48,17 +71,33 @@ async def main():
 
     # 2. Process with LLM
     if settings.llm_config.get("enable", False):
-        logger.info("LLM processing enabled. Summarizing papers...")
+        pending = journal.apply_summaries(papers)
+        logger.info(f"LLM processing enabled. Summarizing {len(pending)} papers ({len(papers) - len(pending)} from journal)...")
         processor = LLMProcessor()
-        papers = await processor.process_papers(papers)
+        await processor.process_papers(pending, on_summarized=journal.record_summary)
+
+        # Extra digest languages are translated from the canonical summaries, not regenerated.
+        extra_languages = [lang for lang in settings.recipients_by_language if lang != settings.llm_language]
+        if extra_languages:
+            translator = SummaryTranslator(
+                processor,
+                cache_dir=settings.translation_cache_dir,
+                batch_size=int(settings.llm_config.get("translation_batch_size", 8)),
+            )
+            papers = await translator.translate_papers(papers, extra_languages)
+
+        await processor.aclose()
     else:
         logger.info("LLM processing disabled. Skipping summarization.")
 
     # 3. Send Email
     logger.info("Preparing to send email...")
     mailer = Mailer()
-    mailer.send_daily_digest(papers)
-    
+    if not mailer.send_daily_digest(papers, journal=journal):
+        logger.error("Some deliveries failed; rerun to retry only the remaining recipients.")
+        sys.exit(1)
+
+    journal.record_completed()
     logger.info("Workflow completed successfully.")
 
 if __name__ == "__main__":
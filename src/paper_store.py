@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PaperStore:
+    """
+    A JSON file of paper dicts keyed by `entry_id`.
+
+    Used for offline work (backfills) where papers outlive a single run.
+    `published` datetimes are stored as ISO 8601 strings and restored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.papers: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        # Accept either the stored mapping or a plain list of papers (e.g. an export).
+        items = raw.values() if isinstance(raw, dict) else raw
+        self.papers = {}
+        for paper in items:
+            if paper.get("entry_id"):
+                self.papers[paper["entry_id"]] = deserialize_paper(paper)
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({k: serialize_paper(p) for k, p in self.papers.items()}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def upsert(self, papers: List[Dict[str, Any]]) -> None:
+        for paper in papers:
+            entry_id = paper.get("entry_id")
+            if not entry_id:
+                logger.warning(f"Skipping paper without entry_id: {paper.get('title', '')[:30]}")
+                continue
+            self.papers.setdefault(entry_id, {}).update(paper)
+
+    def get(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        return self.papers.get(entry_id)
+
+    def unsummarized(self) -> List[Dict[str, Any]]:
+        return [p for p in self.papers.values() if not p.get("ai_summary")]
+
+
+def serialize_paper(paper: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(paper)
+    if isinstance(data.get("published"), datetime):
+        data["published"] = data["published"].isoformat()
+    return data
+
+
+def deserialize_paper(data: Dict[str, Any]) -> Dict[str, Any]:
+    paper = dict(data)
+    if isinstance(paper.get("published"), str):
+        try:
+            paper["published"] = datetime.fromisoformat(paper["published"])
+        except ValueError:
+            pass
+    return paper
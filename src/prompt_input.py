@@ -0,0 +1,174 @@
+import logging
+import re
+import unicodedata
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - listed in requirements.txt; estimate only as a fallback
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# LaTeX commands whose braced argument is kept as plain text.
+_TEXT_COMMANDS = (
+    "emph", "textbf", "textit", "texttt", "textsc", "textrm", "textsf", "underline",
+    "text", "mathrm", "mathcal", "mathbf", "mathbb", "mathit", "mathsf", "mathtt",
+    "mathfrak", "boldsymbol", "operatorname", "url", "mbox",
+)
+# Commands dropped together with their argument.
+_DROP_COMMANDS = ("cite", "citep", "citet", "ref", "eqref", "label", "footnote")
+
+_SYMBOLS = {
+    "alpha": "α", "beta": "β", "gamma": "γ", "delta": "δ", "epsilon": "ε", "varepsilon": "ε",
+    "theta": "θ", "lambda": "λ", "mu": "μ", "pi": "π", "sigma": "σ", "tau": "τ", "phi": "φ",
+    "omega": "ω", "Delta": "Δ", "Omega": "Ω", "Sigma": "Σ",
+    "times": "×", "cdot": "·", "pm": "±", "leq": "≤", "le": "≤", "geq": "≥", "ge": "≥",
+    "neq": "≠", "approx": "≈", "sim": "~", "infty": "∞", "to": "→", "rightarrow": "→",
+    "leftarrow": "←", "Rightarrow": "⇒", "in": "∈", "ell": "ℓ", "log": "log", "ldots": "...",
+    "dots": "...", "cdots": "...", "mid": "|", "left": "", "right": "",
+}
+# Accents over a single symbol become Unicode combining marks (\tilde{O} -> Õ).
+_ACCENTS = {"hat": "\u0302", "widehat": "\u0302", "tilde": "\u0303", "widetilde": "\u0303", "bar": "\u0304",
+            "overline": "\u0304", "vec": "\u20d7", "dot": "\u0307"}
+
+_TEXT_CMD_RE = re.compile(r"\\(?:%s)\s*\{([^{}]*)\}" % "|".join(_TEXT_COMMANDS))
+_DROP_CMD_RE = re.compile(r"\\(?:%s)\s*(?:\[[^\]]*\])?\{[^{}]*\}" % "|".join(_DROP_COMMANDS))
+_SYMBOL_RE = re.compile(r"\\([A-Za-z]+)")
+_ESCAPED_RE = re.compile(r"\\([%&_#$])")
+_MATH_RE = re.compile(r"\$\$?(.+?)\$\$?|\\\((.+?)\\\)", re.DOTALL)
+_SCRIPT_BRACES_RE = re.compile(r"([_^])\{([^{}]*)\}")
+_KNOWN_SYMBOL_RE = re.compile(r"\\(%s)(?![A-Za-z])" % "|".join(sorted(_SYMBOLS, key=len, reverse=True)))
+_FRAC_RE = re.compile(r"\\[dt]?frac\s*\{([^{}]*)\}\s*\{([^{}]*)\}")
+_SQRT_RE = re.compile(r"\\sqrt\s*(?:\[([^\]]*)\])?\s*\{([^{}]*)\}")
+_ACCENT_RE = re.compile(r"\\(%s)\s*\{([^{}]*)\}" % "|".join(_ACCENTS))
+_MATH_SPACE_RE = re.compile(r"\\[,;:!]")
+# Stand-ins for "\{" and "\}" in math, so literal braces survive group stripping.
+_LBRACE, _RBRACE = "\x01", "\x02"
+# URLs are matched first and kept verbatim, so "x.org/~me" keeps its tilde.
+_TILDE_RE = re.compile(r"((?:https?://|www\.)[^\s{}]+|[\w.-]+\.[A-Za-z]{2,}/[^\s{}]*)|(?<!\\)~")
+# Stand-in for "\$" while math is converted, so escaped dollars never open a formula.
+_DOLLAR = "\x00"
+_SPACE_RE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([.,;:)])")
+_CJK_RE = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]")
+
+
+def normalize_abstract(text: Optional[str]) -> str:
+    """
+    Turn a raw arXiv abstract into compact plain text for the prompt.
+
+    Joins hard line wraps, unwraps inline math and text-formatting commands
+    (`$\\mathcal{O}(n)$` -> `O(n)`, `\\emph{x}` -> `x`), maps common symbols to
+    Unicode, drops citations/references and collapses whitespace.
+    """
+    if not text:
+        return ""
+
+    text = _DROP_CMD_RE.sub("", text)
+    # Outside math and URLs, "~" is a LaTeX non-breaking space (as in "Foo~\\cite{x}").
+    text = _TILDE_RE.sub(lambda m: m.group(1) or " ", text)
+    # Innermost-first, so nested formatting like \textbf{\emph{x}} fully unwraps.
+    previous = None
+    while previous != text:
+        previous = text
+        text = _TEXT_CMD_RE.sub(r"\1", text)
+    text = text.replace("\\$", _DOLLAR)
+    text = _MATH_RE.sub(lambda m: _plain_math(m.group(1) or m.group(2)), text)
+    text = _ESCAPED_RE.sub(r"\1", text).replace(_DOLLAR, "$")
+    text = _SYMBOL_RE.sub(lambda m: _SYMBOLS.get(m.group(1), m.group(1)), text)
+    text = _SPACE_RE.sub(" ", text).strip()
+    # NFC folds accent marks into precomposed letters where they exist (O + ◌̃ -> Õ).
+    return unicodedata.normalize("NFC", _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text))
+
+
+def _plain_math(expr: str) -> str:
+    """
+    Inline math as readable plain text: `\\frac{a}{b}` -> `a/b`, `\\sqrt{T}` -> `√T`,
+    `\\tilde{O}` -> `Õ`, `x^{n+1}` -> `x^(n+1)`. Unknown commands keep their name,
+    separated from their argument (`\\foo{x}` -> `foo x`).
+    """
+    expr = expr.replace("\\{", _LBRACE).replace("\\}", _RBRACE)
+    expr = _MATH_SPACE_RE.sub(" ", expr)
+    expr = _KNOWN_SYMBOL_RE.sub(lambda m: _SYMBOLS[m.group(1)], expr)
+    # Innermost-first, so nested structures like \tilde{O}(d\sqrt{T}) resolve fully.
+    previous = None
+    while previous != expr:
+        previous = expr
+        expr = _FRAC_RE.sub(lambda m: f"{_group(m.group(1))}/{_group(m.group(2))}", expr)
+        expr = _SQRT_RE.sub(_sqrt, expr)
+        expr = _ACCENT_RE.sub(_accent, expr)
+        expr = _SCRIPT_BRACES_RE.sub(lambda m: m.group(1) + _group(m.group(2)), expr)
+    expr = _SYMBOL_RE.sub(lambda m: m.group(1) + " ", expr)
+    expr = expr.replace("{", "").replace("}", "").replace(_LBRACE, "{").replace(_RBRACE, "}")
+    return _SPACE_RE.sub(" ", expr).strip()
+
+
+def _group(arg: str) -> str:
+    # Parenthesize anything longer than one symbol or a plain number.
+    arg = arg.strip()
+    return arg if len(arg) <= 1 or arg.isdigit() else f"({arg})"
+
+
+def _sqrt(match: re.Match) -> str:
+    root = "√" + _group(match.group(2))
+    return f"{_group(match.group(1))}{root}" if match.group(1) else root
+
+
+def _accent(match: re.Match) -> str:
+    arg = match.group(2).strip()
+    return arg + _ACCENTS[match.group(1)] if len(arg) == 1 else f"{match.group(1)}({arg})"
+
+
+class TokenCounter:
+    """
+    Counts and truncates text in model tokens.
+
+    Uses the local `tiktoken` encoding (a requirement; its vocabulary file is
+    downloaded once into `TIKTOKEN_CACHE_DIR`). If the encoding cannot be loaded,
+    falls back to a rough average of one token per CJK character and one per four
+    other characters. That is close for plain English but undercounts text heavy
+    in symbols, digits or Greek letters, so the budget is only approximate then.
+    """
+
+    def __init__(self, encoding_name: str = "o200k_base"):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.get_encoding(encoding_name)
+            except Exception as e:
+                logger.warning(f"Tokenizer {encoding_name} unavailable ({e}); using an estimate.")
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        cjk = len(_CJK_RE.findall(text))
+        return cjk + -(-(len(text) - cjk) // 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut `text` to at most `max_tokens`, preferring a sentence or word boundary."""
+        if max_tokens <= 0 or self.count(text) <= max_tokens:
+            return text
+        # Leave room for the ellipsis marker.
+        max_tokens = max(1, max_tokens - 2)
+
+        if self.encoding is not None:
+            cut = self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        else:
+            # Shrink proportionally until the estimate fits.
+            cut = text
+            while cut and self.count(cut) > max_tokens:
+                cut = cut[:int(len(cut) * max_tokens / self.count(cut)) - 1]
+
+        boundary = max(cut.rfind(". "), cut.rfind("。"))
+        if boundary > len(cut) // 2:
+            cut = cut[:boundary + 1]
+        elif " " in cut[len(cut) // 2:]:
+            cut = cut[:cut.rfind(" ")]
+        return cut.rstrip() + " …"
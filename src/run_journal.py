@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+from typing import List, Dict, Any, Optional, Set
+from paper_store import serialize_paper, deserialize_paper
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """
+    Append-only JSONL log of one digest run's completed stages.
+
+    One journal per run date. Each stage appends a record as soon as it finishes:
+    the fetched papers, every summary as it completes, and every delivered
+    recipient. Replaying the file on the next start tells `main()` what can be
+    skipped, so a crash or a failed SMTP send never re-fetches, re-summarizes or
+    double-sends. With `path=None` nothing is persisted (used for dry runs).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.papers: Optional[List[Dict[str, Any]]] = None
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+        self.delivered: Set[str] = set()
+        self.completed = False
+        if path and os.path.exists(path):
+            self._replay()
+            self._terminate_torn_line()
+
+    @classmethod
+    def for_date(cls, state_dir: Optional[str], run_date: str) -> "RunJournal":
+        if not state_dir:
+            return cls(None)
+        os.makedirs(state_dir, exist_ok=True)
+        return cls(os.path.join(state_dir, f"journal-{run_date}.jsonl"))
+
+    @property
+    def resumed(self) -> bool:
+        return self.papers is not None
+
+    def record_fetched(self, papers: List[Dict[str, Any]]) -> None:
+        self.papers = papers
+        self._append({"event": "fetched", "papers": [serialize_paper(p) for p in papers]})
+
+    def record_summary(self, paper: Dict[str, Any]) -> None:
+        if not paper.get("ai_summary") or not paper.get("entry_id"):
+            return
+        summary = {
+            "ai_summary": paper["ai_summary"],
+            "ai_summary_fields": paper.get("ai_summary_fields"),
+        }
+        self.summaries[paper["entry_id"]] = summary
+        self._append({"event": "summary", "entry_id": paper["entry_id"], **summary})
+
+    def record_delivered(self, recipient: str) -> None:
+        self.delivered.add(recipient)
+        self._append({"event": "delivered", "recipient": recipient})
+
+    def record_completed(self) -> None:
+        self.completed = True
+        self._append({"event": "completed"})
+
+    def apply_summaries(self, papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Restore journaled summaries onto `papers`; returns the papers still lacking one."""
+        pending = []
+        for paper in papers:
+            summary = self.summaries.get(paper.get("entry_id"))
+            if summary:
+                paper.update(summary)
+            else:
+                pending.append(paper)
+        return pending
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+
+    def _terminate_torn_line(self) -> None:
+        # Make sure the next record starts on its own line after a crash mid-write.
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _replay(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write; everything before it is valid.
+                    logger.warning(f"Ignoring unreadable journal line in {self.path}")
+                    continue
+                event = record.get("event")
+                if event == "fetched":
+                    self.papers = [deserialize_paper(p) for p in record.get("papers", [])]
+                elif event == "summary":
+                    self.summaries[record["entry_id"]] = {
+                        "ai_summary": record.get("ai_summary"),
+                        "ai_summary_fields": record.get("ai_summary_fields"),
+                    }
+                elif event == "delivered":
+                    self.delivered.add(record["recipient"])
+                elif event == "completed":
+                    self.completed = True
@@ -0,0 +1,151 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# (key, label) pairs in the order the prompt asks for them.
+SUMMARY_FIELDS: List[Tuple[str, str]] = [
+    ("one_liner", "一句话总结"),
+    ("background", "背景/痛点"),
+    ("method", "核心方法"),
+    ("contributions", "主要贡献"),
+    ("results", "结论/效果"),
+    ("limitations", "局限与风险"),
+    ("use_cases", "适用场景"),
+    ("keywords", "关键词"),
+]
+
+FIELD_KEYS = [key for key, _ in SUMMARY_FIELDS]
+FIELD_LABELS = dict(SUMMARY_FIELDS)
+
+# Display labels for translated digests. The prompt and parser always use the
+# Chinese labels above; these only affect rendering.
+FIELD_LABELS_EN: Dict[str, str] = {
+    "one_liner": "TL;DR",
+    "background": "Background",
+    "method": "Method",
+    "contributions": "Contributions",
+    "results": "Results",
+    "limitations": "Limitations",
+    "use_cases": "Use Cases",
+    "keywords": "Keywords",
+}
+
+
+def labels_for(language: str) -> Dict[str, str]:
+    """Field display labels for a digest language (Chinese for zh-*, English otherwise)."""
+    if (language or "").lower().startswith("zh"):
+        return FIELD_LABELS
+    return FIELD_LABELS_EN
+
+
+# Label spellings models commonly drift to, mapped back to field keys.
+_LABEL_ALIASES: Dict[str, str] = {
+    "一句话总结": "one_liner",
+    "一句话概括": "one_liner",
+    "背景/痛点": "background",
+    "背景／痛点": "background",
+    "背景与痛点": "background",
+    "背景": "background",
+    "核心方法": "method",
+    "方法": "method",
+    "主要贡献": "contributions",
+    "贡献": "contributions",
+    "结论/效果": "results",
+    "结论／效果": "results",
+    "结论与效果": "results",
+    "结论": "results",
+    "局限与风险": "limitations",
+    "局限/风险": "limitations",
+    "局限性": "limitations",
+    "局限": "limitations",
+    "适用场景": "use_cases",
+    "应用场景": "use_cases",
+    "关键词": "keywords",
+}
+
+# A field header at the start of a line: optional list/markdown decoration and
+# numbering ("- ", "1. ", "**"), then the label, bracketed (【…】 or […]) or
+# followed by a colon, which may sit inside or after bold markers
+# ("**核心方法**：", "**核心方法：**").
+_LABEL_PATTERN = "|".join(re.escape(a) for a in sorted(_LABEL_ALIASES, key=len, reverse=True))
+_HEADER_RE = re.compile(
+    r"^[ \t>*#\-]*(?:\d+[.、)]\s*)?[ \t*]*(?:"
+    r"[【\[]\s*(?P<bracketed>" + _LABEL_PATTERN + r")\s*[】\]]\s*[:：]?"
+    r"|(?P<bare>" + _LABEL_PATTERN + r")\s*(?:\*\*)?\s*[:：]"
+    r")[ \t*]*",
+    re.MULTILINE,
+)
+
+_PLACEHOLDERS = {"", "…", "...", "……", "无", "n/a", "N/A"}
+_KEYWORD_SPLIT_RE = re.compile(r"[,，、;；]")
+
+
+@dataclass
+class StructuredSummary:
+    """
+    An LLM summary split into the fixed prompt fields.
+
+    `fields` only contains fields that passed validation; `missing` lists the keys
+    that were absent or unusable, in prompt order.
+    """
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def missing(self) -> List[str]:
+        return [key for key in FIELD_KEYS if key not in self.fields]
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing
+
+    @property
+    def keywords(self) -> List[str]:
+        return [k.strip() for k in _KEYWORD_SPLIT_RE.split(self.fields.get("keywords", "")) if k.strip()]
+
+    def merge(self, other: "StructuredSummary") -> "StructuredSummary":
+        """Fill fields missing here from `other`; fields already present are kept."""
+        merged = dict(self.fields)
+        for key, value in other.fields.items():
+            merged.setdefault(key, value)
+        return StructuredSummary(fields=merged)
+
+    def to_text(self, labels: Optional[Dict[str, str]] = None) -> str:
+        labels = labels or FIELD_LABELS
+        return "\n".join(f"【{labels[key]}】{self.fields[key]}" for key in FIELD_KEYS if key in self.fields)
+
+
+def parse_summary(text: Optional[str]) -> StructuredSummary:
+    """
+    Parse a 【字段】-structured LLM response into a `StructuredSummary`.
+
+    Tolerates markdown decoration (bold labels, list bullets, numbering),
+    colon-style headers and multi-line values. Text
+    before the first recognised header is ignored; a field repeated later in the
+    response does not overwrite the first occurrence.
+    """
+    summary = StructuredSummary()
+    if not text:
+        return summary
+
+    matches = list(_HEADER_RE.finditer(text))
+    for i, match in enumerate(matches):
+        label = match.group("bracketed") or match.group("bare")
+        key = _LABEL_ALIASES[label]
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        value = _clean_value(text[match.end():end])
+        if key not in summary.fields and _is_valid(key, value):
+            summary.fields[key] = value
+    return summary
+
+
+def _clean_value(raw: str) -> str:
+    lines = [line.strip().strip("*").strip() for line in raw.strip().splitlines()]
+    return " ".join(line for line in lines if line)
+
+
+def _is_valid(key: str, value: str) -> bool:
+    if value in _PLACEHOLDERS:
+        return False
+    if key == "keywords":
+        return any(k.strip() for k in _KEYWORD_SPLIT_RE.split(value))
+    return True
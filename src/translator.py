@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import List, Dict, Any, Optional
+from summary_parser import FIELD_KEYS
+
+logger = logging.getLogger(__name__)
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+
+class SummaryTranslator:
+    """
+    Produces additional digest languages from the canonical structured summaries.
+
+    Summaries are generated once by `LLMProcessor` in `llm.language`; every other
+    language is filled in by batched translation requests (several papers' fields
+    per call) and cached on disk per language, keyed by entry_id and a hash of the
+    source fields so edited summaries are re-translated.
+
+    Results are stored as `paper["ai_summary_i18n"][language]`, a dict of fields.
+    """
+
+    def __init__(self, processor, cache_dir: Optional[str] = None, batch_size: int = 8):
+        self.processor = processor
+        self.cache_dir = cache_dir
+        self.batch_size = max(1, batch_size)
+
+    async def translate_papers(self, papers: List[Dict[str, Any]], languages: List[str]) -> List[Dict[str, Any]]:
+        if not self.processor.client:
+            return papers
+
+        for language in languages:
+            if language == self.processor.language:
+                continue
+            await self._translate_language(papers, language)
+        return papers
+
+    async def _translate_language(self, papers: List[Dict[str, Any]], language: str) -> None:
+        cache = self._load_cache(language)
+        pending = []
+        for paper in papers:
+            fields = paper.get("ai_summary_fields")
+            if not fields:
+                continue
+            cached = cache.get(paper.get("entry_id") or "")
+            if cached and cached.get("source_hash") == _fields_hash(fields):
+                paper.setdefault("ai_summary_i18n", {})[language] = cached["fields"]
+            else:
+                pending.append(paper)
+
+        hits = sum(1 for p in papers if language in (p.get("ai_summary_i18n") or {}))
+        logger.info(f"Translating summaries to {language}: {hits} cached, {len(pending)} to translate")
+        if not pending:
+            return
+
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        await asyncio.gather(*(self._translate_batch(batch, language) for batch in batches))
+
+        for paper in pending:
+            translated = (paper.get("ai_summary_i18n") or {}).get(language)
+            if translated and paper.get("entry_id"):
+                cache[paper["entry_id"]] = {
+                    "source_hash": _fields_hash(paper["ai_summary_fields"]),
+                    "fields": translated,
+                }
+        self._save_cache(language, cache)
+
+    async def _translate_batch(self, batch: List[Dict[str, Any]], language: str) -> None:
+        # Short positional ids keep the request small; they are mapped back below.
+        source = {str(i): paper["ai_summary_fields"] for i, paper in enumerate(batch)}
+        try:
+            content = await self.processor.complete(
+                json.dumps(source, ensure_ascii=False), system=self._build_system_prompt(language)
+            )
+            translated = json.loads(_FENCE_RE.sub("", content.strip()))
+        except Exception as e:
+            logger.error(f"Failed to translate {len(batch)} summaries to {language}: {type(e).__name__}: {e}")
+            return
+
+        if not isinstance(translated, dict):
+            logger.error(f"Unexpected translation output for {language}: {type(translated).__name__}")
+            return
+
+        for i, paper in enumerate(batch):
+            fields = translated.get(str(i))
+            if not isinstance(fields, dict):
+                continue
+            result = {
+                key: str(fields[key]).strip()
+                for key in FIELD_KEYS
+                if key in paper["ai_summary_fields"] and str(fields.get(key) or "").strip()
+            }
+            # Only accept complete translations; otherwise the canonical text is shown.
+            if result.keys() == paper["ai_summary_fields"].keys():
+                paper.setdefault("ai_summary_i18n", {})[language] = result
+
+    def _build_system_prompt(self, language: str) -> str:
+        # Fixed per language; only the JSON payload goes in the user message.
+        return f"""请将用户消息 JSON 中每篇论文的解读字段翻译为 {language}。
+
+要求：
+- 保持 JSON 结构与所有键名不变，只翻译字符串值。
+- 模型名、数据集名、缩写等专有名词保留原文。
+- 只输出 JSON，不要使用代码块，不要添加解释。"""
+
+    def _cache_path(self, language: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9_-]", "_", language)
+        return os.path.join(self.cache_dir, f"{safe}.json")
+
+    def _load_cache(self, language: str) -> Dict[str, Any]:
+        path = self._cache_path(language)
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable translation cache {path}: {e}")
+            return {}
+
+    def _save_cache(self, language: str, cache: Dict[str, Any]) -> None:
+        path = self._cache_path(language)
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def _fields_hash(fields: Dict[str, str]) -> str:
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
@@ -1,9 +1,116 @@
 import os
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SRC_DIR = os.path.join(ROOT_DIR, "src")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
 
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+# A well-formed structured summary, as the model is asked to produce it.
+FULL_RESPONSE = load_fixture("summary_response.txt").decode("utf-8").rstrip("\n")
+
+
+class LocalServer:
+    """
+    Threaded HTTP server on a free localhost port, for talking to real clients in tests.
+
+    Subclasses return their request handler class from `make_handler`; it is
+    built after the subclass has set up its own state. Usable as a context manager.
+    """
+
+    def __init__(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def make_handler(self):
+        raise NotImplementedError
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Keep-alive request handler that does not log every request to stderr."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        return
+
+
+class FeedServer(LocalServer):
+    """
+    Serves recorded feed bodies on localhost, keyed by URL path.
+
+    Every body gets a stable ETag, and `If-None-Match` revalidation is answered
+    with 304 so conditional requests can be exercised end to end.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        super().__init__()
+
+    def make_handler(self):
+        server = self
+
+        class Handler(QuietHandler):
+            def do_GET(self):
+                server.requests.append({"path": self.path, "headers": dict(self.headers)})
+                body = server.routes.get(urlparse(self.path).path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                etag = f'"{len(body)}-{hash(body) & 0xffffffff:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+@pytest.fixture
+def feed_server():
+    with FeedServer() as server:
+        yield server
@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
-from arxiv_client import ArxivClient
+from arxiv_client import ArxivClient, ArxivFetchError
 
 @pytest.fixture
 def mock_settings():
@@ -122,3 +122,94 @@ def test_fetch_papers_top_n_validation(mock_settings):
         client.fetch_papers(top_n=-1)
     with pytest.raises(ValueError):
         client.fetch_papers(top_n=1.5)  # type: ignore[arg-type]
+
+
+@patch('arxiv_client.arxiv.Client')
+@patch('arxiv_client.arxiv.Search')
+def test_fetch_papers_watchlist_hits_bypass_keywords_and_boost_rank(mock_search, mock_client_cls, mock_settings):
+    mock_settings.watchlist_authors = ["Müller, Ana"]
+    mock_settings.watchlist_affiliations = []
+    mock_settings.watchlist_weight = 10
+    mock_client_instance = mock_client_cls.return_value
+
+    now = datetime.now(timezone.utc)
+
+    def author(name):
+        a = MagicMock()
+        a.name = name
+        a.affiliation = None
+        return a
+
+    p1 = MagicMock()
+    p1.title = "LLM Agent Survey"
+    p1.summary = "LLM agent."
+    p1.published = now - timedelta(hours=2)
+    p1.authors = [author("Someone Else")]
+    p1.pdf_url = "http://pdf1"
+    p1.entry_id = "1"
+    p1.categories = ["cs.CV"]
+
+    p2 = MagicMock()
+    p2.title = "Point Cloud Segmentation"
+    p2.summary = "No keywords here."
+    p2.published = now - timedelta(hours=2)
+    p2.authors = [author("Ana Muller")]
+    p2.pdf_url = "http://pdf2"
+    p2.entry_id = "2"
+    p2.categories = ["cs.CV"]
+
+    mock_client_instance.results.return_value = [p1, p2]
+
+    results = ArxivClient().fetch_papers()
+
+    assert [r["title"] for r in results] == ["Point Cloud Segmentation", "LLM Agent Survey"]
+    assert results[0]["watchlist_hits"] == ["Müller, Ana"]
+    assert results[1]["watchlist_hits"] == []
+
+
+@patch('arxiv_client.arxiv.Client')
+@patch('arxiv_client.arxiv.Search')
+def test_fetch_papers_raises_when_arxiv_fails(mock_search, mock_client_cls, mock_settings):
+    def results(search):
+        raise ConnectionError("connection reset")
+        yield
+
+    mock_client_cls.return_value.results.side_effect = results
+
+    with pytest.raises(ArxivFetchError):
+        ArxivClient().fetch_papers()
+
+
+@patch('arxiv_client.arxiv.Client')
+@patch('arxiv_client.arxiv.Search')
+def test_fetch_papers_skips_undated_entries(mock_search, mock_client_cls, mock_settings, caplog):
+    undated = MagicMock(title="Undated LLM Paper", summary="About LLM", published=None, entry_id="bad")
+    dated = MagicMock(title="Dated LLM Paper", summary="About LLM", authors=[], entry_id="good")
+    dated.published = datetime.now(timezone.utc) - timedelta(hours=1)
+    mock_client_cls.return_value.results.return_value = [undated, dated]
+
+    results = ArxivClient().fetch_papers()
+
+    assert [r["entry_id"] for r in results] == ["good"]
+    assert "without a usable date: bad" in caplog.text
+
+
+@patch('arxiv_client.arxiv.Client')
+@patch('arxiv_client.arxiv.Search')
+def test_fetch_papers_between_queries_submission_range(mock_search, mock_client_cls, mock_settings):
+    mock_settings.subjects = ["cs.SE", "cs.LG"]
+    mock_settings.keywords = ["agent"]
+    old = MagicMock(title="Agent Paper", summary="About agents", authors=[], entry_id="1",
+                    published=datetime(2024, 5, 2, tzinfo=timezone.utc))
+    other = MagicMock(title="Vision", summary="Images", authors=[], entry_id="2",
+                      published=datetime(2024, 5, 3, tzinfo=timezone.utc))
+    mock_client_cls.return_value.results.return_value = [old, other]
+
+    papers = ArxivClient().fetch_papers_between(
+        datetime(2024, 5, 1, tzinfo=timezone.utc), datetime(2024, 5, 15, tzinfo=timezone.utc)
+    )
+
+    query = mock_search.call_args.kwargs["query"]
+    assert query == "(cat:cs.SE OR cat:cs.LG) AND submittedDate:[202405010000 TO 202405150000]"
+    assert [p["entry_id"] for p in papers] == ["1"]
+    assert "_relevance_score" not in papers[0]
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from arxiv_client import ArxivClient
+from arxiv_feed import AtomFeedClient, ConditionalFetcher, ListingFeedClient, iter_atom_entries, iter_listing_entries
+from tests.conftest import load_fixture
+
+
+def _chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_iter_atom_entries_extracts_fields_from_small_chunks():
+    entries = list(iter_atom_entries(_chunked(load_fixture("arxiv_api_query.xml"), 64)))
+
+    assert [e.entry_id for e in entries] == [
+        "http://arxiv.org/abs/2405.07001v1",
+        "http://arxiv.org/abs/2405.06990v1",
+        "http://arxiv.org/abs/2405.01234v2",
+    ]
+    first = entries[0]
+    assert first.title == "Test-Time Repair of LLM Agents for Software Engineering Tasks"
+    assert first.summary.startswith("We study how large language model")
+    assert first.published == datetime(2024, 5, 13, 17, 59, 58, tzinfo=timezone.utc)
+    assert [a.name for a in first.authors] == ["Ana Müller", "Wei Zhang"]
+    assert first.authors[0].affiliation == "ETH Zurich"
+    assert first.pdf_url == "http://arxiv.org/pdf/2405.07001v1"
+    assert first.categories == ["cs.SE", "cs.AI"]
+
+
+def test_unparseable_published_falls_back_to_updated():
+    feed = (
+        b'<feed xmlns="http://www.w3.org/2005/Atom">'
+        b'<entry><id>http://arxiv.org/abs/2405.00001v1</id><title>T</title><summary>S</summary>'
+        b'<published>not a date</published><updated>2024-05-13T17:59:58Z</updated></entry>'
+        b'</feed>'
+    )
+
+    entry, = iter_atom_entries([feed])
+
+    assert entry.published == datetime(2024, 5, 13, 17, 59, 58, tzinfo=timezone.utc)
+
+
+def test_conditional_request_reuses_cached_body(feed_server, tmp_path):
+    feed_server.routes["/api/query"] = load_fixture("arxiv_api_query.xml")
+    client = AtomFeedClient(
+        api_url=feed_server.base_url + "/api/query",
+        fetcher=ConditionalFetcher(cache_dir=str(tmp_path)),
+    )
+
+    first = list(client.iter_entries("cat:cs.SE"))
+    second = list(client.iter_entries("cat:cs.SE"))
+
+    assert len(feed_server.requests) == 2
+    assert "If-None-Match" not in feed_server.requests[0]["headers"]
+    assert feed_server.requests[1]["headers"]["If-None-Match"]
+    assert [e.entry_id for e in second] == [e.entry_id for e in first]
+
+
+def test_unchanged_listing_is_not_replayed(feed_server, tmp_path):
+    feed_server.routes["/rss/cs.LG"] = load_fixture("arxiv_rss_cs.LG.xml")
+    client = ListingFeedClient(base_url=feed_server.base_url + "/rss", fetcher=ConditionalFetcher(cache_dir=str(tmp_path)))
+
+    first = list(client.iter_entries("cs.LG"))
+    second = list(client.iter_entries("cs.LG"))
+
+    assert len(first) == 3
+    assert feed_server.requests[1]["headers"]["If-None-Match"]
+    assert second == []
+
+
+def test_early_stop_still_caches_complete_body(feed_server, tmp_path):
+    feed_server.routes["/api/query"] = load_fixture("arxiv_api_query.xml")
+    fetcher = ConditionalFetcher(cache_dir=str(tmp_path), chunk_size=256)
+    client = AtomFeedClient(api_url=feed_server.base_url + "/api/query", fetcher=fetcher)
+
+    entries = client.iter_entries("cat:cs.SE")
+    next(entries)
+    entries.close()
+
+    replay = list(client.iter_entries("cat:cs.SE"))
+    assert len(replay) == 3
+
+
+def test_api_error_entry_raises(feed_server):
+    feed_server.routes["/api/query"] = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/api/errors#incorrect_id_format_for_1234</id>
+    <title>Error</title>
+    <summary>incorrect id format for 1234</summary>
+  </entry>
+</feed>"""
+    client = AtomFeedClient(api_url=feed_server.base_url + "/api/query")
+    with pytest.raises(RuntimeError):
+        list(client.iter_entries("id:1234"))
+
+
+def test_fetch_papers_with_atom_backend(feed_server):
+    now = datetime.now(timezone.utc)
+    body = load_fixture("arxiv_api_query.xml").decode("utf-8")
+    body = body.replace("2024-05-13T17:59:58Z", (now - timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    body = body.replace("2024-05-13T16:20:11Z", (now - timedelta(hours=3)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    feed_server.routes["/api/query"] = body.encode("utf-8")
+
+    with patch("arxiv_client.settings") as mock:
+        mock.subjects = ["cs.SE", "cs.LG"]
+        mock.keywords = ["LLM", "Agent"]
+        mock.match_logic = "OR"
+        mock.fetch_backend = "atom"
+        mock.arxiv_api_url = feed_server.base_url + "/api/query"
+        mock.arxiv_cache_dir = None
+
+        results = ArxivClient().fetch_papers()
+
+    assert len(results) == 1
+    assert results[0]["title"] == "Test-Time Repair of LLM Agents for Software Engineering Tasks"
+    assert results[0]["authors"] == ["Ana Müller", "Wei Zhang"]
+    assert "search_query=cat%3Acs.SE+OR+cat%3Acs.LG" in feed_server.requests[0]["path"]
+
+
+def test_iter_listing_entries_classifies_announce_types():
+    entries = list(iter_listing_entries(_chunked(load_fixture("arxiv_rss_cs.LG.xml"), 128)))
+
+    assert [e.announce_type for e in entries] == ["new", "new", "replace"]
+    first = entries[0]
+    assert first.entry_id == "http://arxiv.org/abs/2405.06500v1"
+    assert first.pdf_url == "http://arxiv.org/pdf/2405.06500v1"
+    assert first.summary == "An agent that generates mutants for large codebases."
+    assert first.categories == ["cs.LG", "cs.SE"]
+    assert [a.name for a in entries[2].authors] == ["Tom Berg", "Ines Costa"]
+    assert entries[0].published.tzinfo is not None
+
+
+@pytest.mark.parametrize("subjects", [["cs.SE", "cs.LG"], ["cs.LG", "cs.SE"]])
+def test_fetch_papers_with_listing_source(feed_server, subjects):
+    feed_server.routes["/rss/cs.SE"] = load_fixture("arxiv_rss_cs.SE.xml")
+    feed_server.routes["/rss/cs.LG"] = load_fixture("arxiv_rss_cs.LG.xml")
+
+    with patch("arxiv_client.settings") as mock:
+        mock.subjects = subjects
+        mock.keywords = ["LLM", "Agent"]
+        mock.match_logic = "OR"
+        mock.fetch_source = "listing"
+        mock.announce_types = ["new", "cross"]
+        mock.arxiv_listing_url = feed_server.base_url + "/rss"
+        mock.arxiv_cache_dir = None
+
+        results = ArxivClient().fetch_papers()
+
+    # One request per category, no paging, no time window on the fixed fixture dates.
+    assert [r["path"] for r in feed_server.requests] == [f"/rss/{s}" for s in subjects]
+    # The cross-list is kept once, labelled as announced in its primary category (cs.LG);
+    # replacements are dropped.
+    assert sorted((r["title"], r["announce_type"]) for r in results) == [
+        ("Mutation Testing Agents at Scale", "new"),
+        ("Test-Time Repair of LLM Agents for Software Engineering Tasks", "new"),
+    ]
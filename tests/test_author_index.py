@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+from author_index import AuthorWatchlist, normalize_text, split_name
+
+
+def test_normalize_text_strips_diacritics_and_punctuation():
+    assert normalize_text("José  García-López") == "jose garcia lopez"
+    assert normalize_text("Søren Kierkegård") == "soren kierkegard"
+
+
+def test_split_name_handles_both_orders():
+    assert split_name("Geoffrey E. Hinton") == (["geoffrey", "e"], "hinton")
+    assert split_name("Hinton, Geoffrey E.") == (["geoffrey", "e"], "hinton")
+
+
+def test_split_name_keeps_particles_with_family_name():
+    expected = (["ludwig"], "van beethoven")
+    assert split_name("Ludwig van Beethoven") == expected
+    assert split_name("van Beethoven, Ludwig") == expected
+    assert split_name("Beethoven, Ludwig van") == expected
+    assert split_name("De Li") == (["de"], "li")
+
+
+def test_match_author_variants():
+    watchlist = AuthorWatchlist(["José García", "Wei Zhang", "Hinton, Geoffrey", "Y. LeCun"])
+
+    assert watchlist.match_author("Jose Garcia") == ["José García"]
+    assert watchlist.match_author("J. García") == ["José García"]
+    assert watchlist.match_author("Zhang Wei") == ["Wei Zhang"]
+    assert watchlist.match_author("Geoffrey E. Hinton") == ["Hinton, Geoffrey"]
+    assert watchlist.match_author("Yann LeCun") == ["Y. LeCun"]
+    assert watchlist.match_author("Wei Zhao") == []
+    # Swapped order matches by full name only, not by the swapped initial.
+    assert watchlist.match_author("Z. Wei") == []
+    assert watchlist.match_author("L. Yann") == []
+    # A full name on both sides must agree on the given name, not just the initial.
+    assert watchlist.match_author("José Gomez") == []
+    assert watchlist.match_author("Jorge García") == []
+
+
+def test_match_collects_author_and_affiliation_hits():
+    watchlist = AuthorWatchlist(["Ana Müller"], ["ETH Zurich", "Google DeepMind"])
+    authors = [
+        SimpleNamespace(name="Ana Muller", affiliation=None),
+        SimpleNamespace(name="Bo Li", affiliation="Dept. of CS, ETH Zürich"),
+        SimpleNamespace(name="Cy Ng", affiliation="Google Research"),
+    ]
+
+    assert watchlist.match(authors) == ["Ana Müller", "ETH Zurich"]
+    assert watchlist.match(["Ana Müller"]) == ["Ana Müller"]
+
+
+def test_empty_watchlist_never_matches():
+    watchlist = AuthorWatchlist()
+
+    assert not watchlist
+    assert watchlist.match(["Anyone"]) == []
+
+
+def test_single_name_entries_match_only_the_same_single_name(caplog):
+    watchlist = AuthorWatchlist(["Madonna", "  ...  "])
+
+    assert watchlist
+    assert watchlist.match_author("Madonna") == ["Madonna"]
+    assert watchlist.match_author("John Madonna") == []
+    assert "Ignoring watchlist author '  ...  '" in caplog.text
+
+
+def test_particle_names_match_in_either_order():
+    watchlist = AuthorWatchlist(["Ludwig van Beethoven"])
+
+    assert watchlist.match_author("van Beethoven, Ludwig") == ["Ludwig van Beethoven"]
+    assert watchlist.match_author("L. van Beethoven") == ["Ludwig van Beethoven"]
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import re
+from unittest.mock import patch
+
+import pytest
+
+import backfill as backfill_module
+import llm_processor as llm_module
+from batch_processor import BatchSummarizer
+from paper_store import PaperStore
+from tests.conftest import FULL_RESPONSE, LocalServer, QuietHandler
+
+
+class FakeBatchServer(LocalServer):
+    """
+    Minimal OpenAI-compatible /files + /batches server.
+
+    Each poll advances a batch one step (validating -> in_progress -> completed);
+    on completion every request is answered with a canned chat completion.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.batches = {}
+        self.created = 0
+        self.replies = {}
+        self.posts = []
+        super().__init__()
+
+    def make_handler(self):
+        server = self
+
+        class Handler(QuietHandler):
+            def _json(self, payload, status=200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.posts.append(self.path)
+                if self.path.endswith("/files"):
+                    # Pull the JSONL payload out of the multipart body.
+                    lines = re.findall(rb'^\{"custom_id".*$', raw, re.MULTILINE)
+                    file_id = f"file-{len(server.files)}"
+                    server.files[file_id] = b"\n".join(line.rstrip(b"\r") for line in lines) + b"\n"
+                    return self._json({
+                        "id": file_id, "object": "file", "bytes": len(raw), "created_at": 0,
+                        "filename": "input.jsonl", "purpose": "batch", "status": "processed",
+                    })
+                if self.path.endswith("/batches"):
+                    req = json.loads(raw)
+                    server.created += 1
+                    batch = {
+                        "id": f"batch-{server.created}", "object": "batch", "endpoint": req["endpoint"],
+                        "input_file_id": req["input_file_id"], "completion_window": req["completion_window"],
+                        "created_at": 0, "status": "validating", "output_file_id": None,
+                    }
+                    server.batches[batch["id"]] = batch
+                    return self._json(batch)
+                self._json({"error": "not found"}, 404)
+
+            def do_GET(self):
+                match = re.search(r"/batches/([^/]+)$", self.path)
+                if match:
+                    batch = server.batches[match.group(1)]
+                    server.advance(batch)
+                    return self._json(batch)
+                match = re.search(r"/files/([^/]+)/content$", self.path)
+                if match:
+                    body = server.files[match.group(1)]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                self._json({"error": "not found"}, 404)
+
+        return Handler
+
+    def advance(self, batch):
+        if batch["status"] == "validating":
+            batch["status"] = "in_progress"
+        elif batch["status"] == "in_progress":
+            output = []
+            for line in self.files[batch["input_file_id"]].splitlines():
+                request = json.loads(line)
+                output.append(json.dumps({
+                    "id": "resp", "custom_id": request["custom_id"], "error": None,
+                    "response": {"status_code": 200, "body": {
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": self.replies.get(request["custom_id"], FULL_RESPONSE)}}],
+                        "usage": {"prompt_tokens": 400, "completion_tokens": 200, "prompt_cache_hit_tokens": 300},
+                    }},
+                }, ensure_ascii=False))
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = ("\n".join(output) + "\n").encode("utf-8")
+            batch["status"] = "completed"
+            batch["output_file_id"] = file_id
+
+
+@pytest.fixture
+def batch_server():
+    with FakeBatchServer() as server:
+        yield server
+
+
+@pytest.fixture
+def processor(batch_server):
+    with patch("llm_processor.settings") as mock:
+        mock.llm_config = {"enable": True, "model": "test-model", "language": "zh-CN"}
+        mock.llm_api_key = "sk-test"
+        mock.llm_base_url = batch_server.base_url + "/v1"
+        yield llm_module.LLMProcessor()
+
+
+def _store(tmp_path, n):
+    store = PaperStore(str(tmp_path / "papers.json"))
+    store.upsert([
+        {"entry_id": f"http://arxiv.org/abs/2405.0000{i}v1", "title": f"Paper {i}", "summary": "Abstract."}
+        for i in range(n)
+    ])
+    store.save()
+    return store
+
+
+def test_write_requests_uses_prompt_and_entry_id(processor, tmp_path):
+    summarizer = BatchSummarizer(processor, checkpoint_path=str(tmp_path / "ckpt.json"))
+    path = tmp_path / "requests.jsonl"
+    summarizer.write_requests([{"entry_id": "id-1", "title": "T", "summary": "S"}], str(path))
+
+    line = json.loads(path.read_text(encoding="utf-8"))
+    assert line["custom_id"] == "id-1"
+    assert line["url"] == "/v1/chat/completions"
+    assert line["body"]["model"] == "test-model"
+    assert line["body"]["messages"][-1]["content"] == "论文标题：T\n论文摘要：S"
+    assert line["body"]["messages"][0]["content"] == processor.system_prompt
+
+
+def test_batch_run_merges_results_by_entry_id(processor, batch_server, tmp_path):
+    store = _store(tmp_path, 5)
+    summarizer = BatchSummarizer(processor, checkpoint_path=str(tmp_path / "ckpt.json"), poll_interval=0, max_requests=2)
+
+    merged = asyncio.run(summarizer.run(store))
+
+    assert merged == 5
+    assert batch_server.created == 3
+    reloaded = PaperStore(store.path)
+    assert not reloaded.unsummarized()
+    assert reloaded.get("http://arxiv.org/abs/2405.00003v1")["ai_summary_fields"]["keywords"] == "LLM，智能体，程序修复"
+    assert processor.usage_stats()["prompt_tokens"] == 2000
+    assert processor.usage_stats()["cache_hit_ratio"] == 0.75
+
+
+def test_batch_run_resumes_from_checkpoint_without_resubmitting(processor, batch_server, tmp_path):
+    store = _store(tmp_path, 2)
+    checkpoint = str(tmp_path / "ckpt.json")
+
+    async def scenario():
+        # Simulate a backfill that died right after submitting.
+        first = BatchSummarizer(processor, checkpoint_path=checkpoint, poll_interval=0)
+        record = await first._submit(store.unsummarized())
+        first._save_checkpoint({"batches": [record]})
+
+        resumed = BatchSummarizer(processor, checkpoint_path=checkpoint, poll_interval=0)
+        return await resumed.run(PaperStore(store.path))
+
+    merged = asyncio.run(scenario())
+
+    assert merged == 2
+    assert batch_server.created == 1
+    with open(checkpoint, encoding="utf-8") as f:
+        assert json.load(f)["batches"][0]["done"] is True
+
+
+def _user_prompts(checkpoint_path):
+    with open(checkpoint_path, encoding="utf-8") as f:
+        record = json.load(f)["batches"][-1]
+    with open(record["input_path"], encoding="utf-8") as f:
+        return {line["custom_id"]: line["body"]["messages"][-1]["content"] for line in map(json.loads, f)}
+
+
+def test_partial_batch_results_are_repaired_in_the_next_batch(processor, batch_server, tmp_path):
+    store = _store(tmp_path, 2)
+    checkpoint = str(tmp_path / "ckpt.json")
+    partial_id = "http://arxiv.org/abs/2405.00001v1"
+    batch_server.replies[partial_id] = FULL_RESPONSE.replace("【局限与风险】仅在 Python 仓库上验证\n", "")
+
+    async def scenario():
+        first = await BatchSummarizer(processor, checkpoint_path=checkpoint, poll_interval=0).run(store)
+        batch_server.replies[partial_id] = "【局限与风险】样本规模有限"
+        second = await BatchSummarizer(processor, checkpoint_path=checkpoint, poll_interval=0).run(store)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert (first, second) == (1, 1)
+    repair_prompt = _user_prompts(checkpoint)[partial_id]
+    assert "【局限与风险】" in repair_prompt and "【核心方法】" not in repair_prompt
+    assert store.get(partial_id)["ai_summary_fields"]["limitations"] == "样本规模有限"
+    assert store.get(partial_id)["ai_summary_fields"]["method"] == "失败轨迹→定位错误步骤→局部重试"
+    assert not any(path.endswith("/chat/completions") for path in batch_server.posts)
+
+
+def test_batch_attempts_per_paper_are_capped(processor, batch_server, tmp_path):
+    store = _store(tmp_path, 1)
+    checkpoint = str(tmp_path / "ckpt.json")
+    batch_server.replies["http://arxiv.org/abs/2405.00000v1"] = FULL_RESPONSE.replace("【关键词】LLM，智能体，程序修复", "")
+
+    async def scenario():
+        for _ in range(3):
+            await BatchSummarizer(processor, checkpoint_path=checkpoint, poll_interval=0, max_attempts=2).run(store)
+
+    asyncio.run(scenario())
+
+    # Second attempt hits the cap, so its (still partial) summary is kept and nothing more is submitted.
+    assert batch_server.created == 2
+    paper = store.get("http://arxiv.org/abs/2405.00000v1")
+    assert paper["ai_summary"] and "keywords" not in paper["ai_summary_fields"]
+
+
+def test_backfill_fetches_date_range_into_store_then_batches(processor, batch_server, tmp_path):
+    ranges = []
+
+    class FakeArxivClient:
+        def fetch_papers_between(self, start, end, max_results=2000):
+            ranges.append((start.isoformat(), end.isoformat()))
+            return [
+                {"entry_id": f"http://arxiv.org/abs/2405.0000{i}v1", "title": f"Paper {i}", "summary": "Abstract."}
+                for i in range(3)
+            ]
+
+    store_path = str(tmp_path / "papers.json")
+    with patch.object(backfill_module, "ArxivClient", FakeArxivClient), \
+            patch.object(backfill_module, "LLMProcessor", lambda: processor):
+        merged = asyncio.run(backfill_module.backfill([
+            "--store", store_path, "--since", "2024-05-01", "--until", "2024-05-14", "--poll-interval", "0",
+        ]))
+
+    assert ranges == [("2024-05-01T00:00:00+00:00", "2024-05-15T00:00:00+00:00")]
+    assert merged == 3
+    store = PaperStore(store_path)
+    assert len(store.papers) == 3 and not store.unsummarized()
+    assert processor.http_pool.client.is_closed
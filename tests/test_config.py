@@ -36,3 +36,22 @@ def test_env_vars_precedence(tmp_path, monkeypatch):
     
     config = Config(str(config_file))
     assert config.mail_recipient == "env@example.com"
+
+def test_recipients_by_language(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.yaml"
+    with open(config_file, 'w') as f:
+        yaml.dump({
+            "llm": {"language": "zh-CN"},
+            "email": {
+                "recipients": ["a@example.com", "b@example.com"],
+                "recipients_by_language": {"en": ["b@example.com", "c@example.com"]},
+            },
+        }, f)
+    monkeypatch.delenv("MAIL_RECIPIENTS", raising=False)
+    monkeypatch.delenv("MAIL_RECIPIENT", raising=False)
+
+    config = Config(str(config_file))
+    assert config.recipients_by_language == {
+        "zh-CN": ["a@example.com"],
+        "en": ["b@example.com", "c@example.com"],
+    }
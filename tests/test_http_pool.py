@@ -0,0 +1,49 @@
+import asyncio
+from unittest.mock import patch
+
+import llm_processor as llm_module
+from http_pool import LLMHttpPool
+
+
+def test_pool_reuses_connections_and_reports_metrics(feed_server):
+    feed_server.routes["/ping"] = b"pong"
+
+    async def scenario():
+        pool = LLMHttpPool({"http2": False, "connect_timeout": 2, "read_timeout": 5}, concurrency=2)
+        try:
+            for _ in range(3):
+                response = await pool.client.get(feed_server.base_url + "/ping")
+                assert response.text == "pong"
+            return pool.stats()
+        finally:
+            await pool.aclose()
+
+    stats = asyncio.run(scenario())
+
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["reuse_ratio"] == round(1 - 1 / 3, 3)
+    assert stats["open"] == 1 and stats["idle"] == 1
+
+
+def test_pool_limits_and_timeouts_follow_config():
+    pool = LLMHttpPool({"connect_timeout": 3, "read_timeout": 45, "keepalive_expiry": 12}, concurrency=7)
+
+    assert pool.timeout.connect == 3
+    assert pool.timeout.read == 45
+    assert pool.limits.max_connections == 7
+    assert pool.limits.keepalive_expiry == 12
+
+
+def test_fallback_client_shares_the_pool():
+    with patch("llm_processor.settings") as mock:
+        mock.llm_config = {"enable": True, "model": "m", "concurrency": 3}
+        mock.llm_api_key = "sk-test"
+        mock.llm_base_url = "https://api.example.com/v1"
+        processor = llm_module.LLMProcessor()
+
+        fallback = processor._make_client(processor._alt_base_url)
+
+    assert processor.client._client is processor.http_pool.client
+    assert fallback._client is processor.http_pool.client
+    assert processor.semaphore._value == 3
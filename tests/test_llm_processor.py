@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import llm_processor as llm_module
+from tests.conftest import FULL_RESPONSE
+
+
+class FakeCompletions:
+    def __init__(self, replies, usage=None):
+        self.replies = list(replies)
+        self.usage = usage
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.replies.pop(0)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=self.usage)
+
+
+@pytest.fixture
+def processor():
+    with patch("llm_processor.settings") as mock:
+        mock.llm_config = {"enable": True, "model": "test-model", "language": "zh-CN", "max_input_tokens": 64}
+        mock.llm_api_key = "sk-test"
+        mock.llm_base_url = "http://127.0.0.1:9/v1"
+        yield llm_module.LLMProcessor()
+
+
+def _use_replies(processor, replies, usage=None):
+    completions = FakeCompletions(replies, usage)
+    processor.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return completions
+
+
+def _paper():
+    return {"title": "Test-Time Repair of LLM Agents", "summary": "We study LLM agents."}
+
+
+def test_complete_summary_needs_no_repair(processor):
+    completions = _use_replies(processor, [FULL_RESPONSE])
+
+    paper = asyncio.run(processor.summarize_paper(_paper()))
+
+    assert len(completions.calls) == 1
+    assert paper["ai_summary_fields"]["keywords"] == "LLM，智能体，程序修复"
+    assert paper["ai_summary"].startswith("【一句话总结】")
+
+
+def test_missing_fields_are_repaired_with_targeted_request(processor):
+    partial = FULL_RESPONSE.replace("【局限与风险】仅在 Python 仓库上验证\n", "")
+    completions = _use_replies(processor, [partial, "【局限与风险】样本规模有限"])
+
+    paper = asyncio.run(processor.summarize_paper(_paper()))
+
+    assert len(completions.calls) == 2
+    assert completions.calls[1]["messages"][0] == completions.calls[0]["messages"][0]
+    repair_prompt = completions.calls[1]["messages"][-1]["content"]
+    assert "【局限与风险】" in repair_prompt
+    assert "【核心方法】" not in repair_prompt
+    assert paper["ai_summary_fields"]["limitations"] == "样本规模有限"
+    assert len(paper["ai_summary_fields"]) == 8
+
+
+def test_unparseable_response_falls_back_to_raw_text(processor):
+    completions = _use_replies(processor, ["Just some prose."])
+
+    paper = asyncio.run(processor.summarize_paper(_paper()))
+
+    assert len(completions.calls) == 1
+    assert paper["ai_summary"] == "Just some prose."
+    assert paper["ai_summary_fields"] is None
+
+
+def test_mostly_missing_summary_is_not_repaired_and_keeps_raw_text(processor):
+    partial = "【一句话总结】只解析出两项\n其余内容是模型自由发挥的段落。\n【关键词】LLM，智能体，程序修复"
+    completions = _use_replies(processor, [partial])
+
+    paper = asyncio.run(processor.summarize_paper(_paper()))
+
+    assert len(completions.calls) == 1
+    assert paper["ai_summary"] == partial
+    assert paper["ai_summary_fields"] is None
+
+
+def test_prompt_keeps_instructions_in_stable_system_prefix(processor):
+    completions = _use_replies(processor, [FULL_RESPONSE, FULL_RESPONSE])
+    first = {"title": "A", "summary": "We bound the error by\n$\\mathcal{O}(n)$ with \\emph{high} probability."}
+    second = {"title": "B", "summary": "Another abstract."}
+
+    asyncio.run(processor.summarize_paper(first))
+    asyncio.run(processor.summarize_paper(second))
+
+    system, user = completions.calls[0]["messages"]
+    assert system == completions.calls[1]["messages"][0]
+    assert "【关键词】" in system["content"] and "zh-CN" in system["content"]
+    assert user["content"] == "论文标题：A\n论文摘要：We bound the error by O(n) with high probability."
+
+
+def test_long_abstract_is_truncated_to_input_budget(processor):
+    completions = _use_replies(processor, [FULL_RESPONSE])
+    paper = {"entry_id": "id-1", "title": "Long", "summary": "Sentence about results. " * 200}
+
+    asyncio.run(processor.summarize_paper(paper))
+
+    abstract = completions.calls[0]["messages"][-1]["content"].split("论文摘要：", 1)[1]
+    assert processor.tokenizer.count(abstract) <= 64
+    assert abstract.endswith("…")
+    assert paper["summary"] == "Sentence about results. " * 200
+    assert processor.usage_stats()["truncated"] == 1
+
+
+def test_usage_totals_and_cache_hit_ratio(processor):
+    usage = SimpleNamespace(prompt_tokens=500, completion_tokens=120,
+                            prompt_tokens_details=SimpleNamespace(cached_tokens=400))
+    _use_replies(processor, [FULL_RESPONSE, FULL_RESPONSE], usage=usage)
+
+    asyncio.run(processor.summarize_paper(_paper()))
+    asyncio.run(processor.summarize_paper(_paper()))
+
+    stats = processor.usage_stats()
+    assert stats["requests"] == 2
+    assert stats["prompt_tokens"] == 1000
+    assert stats["cached_tokens"] == 800
+    assert stats["cache_hit_ratio"] == 0.8
@@ -47,3 +47,101 @@ def test_send_message_success_even_if_quit_fails(monkeypatch):
     assert sent["count"] == 1
     assert created["count"] == 1
 
+
+
+def test_template_renders_structured_summary_fields():
+    m = mailer_module.Mailer()
+    template = m.env.get_template("email_template.html")
+    papers = [
+        {
+            "title": "Structured",
+            "authors": ["A"],
+            "summary": "abstract",
+            "pdf_url": "http://pdf",
+            "ai_summary": "【一句话总结】结构化",
+            "ai_summary_fields": {"one_liner": "结构化", "keywords": "A, B, C"},
+        },
+        {
+            "title": "Raw",
+            "authors": ["B"],
+            "summary": "abstract",
+            "pdf_url": "http://pdf",
+            "ai_summary": "line1\nline2",
+        },
+    ]
+
+    html = template.render(papers=papers, summary_fields=m._summary_fields("zh-CN"), subject_prefix="[T]", date_str="2024-05-14")
+
+    assert "<strong>【一句话总结】</strong>结构化" in html
+    assert "<strong>【关键词】</strong>A, B, C" in html
+    assert "【核心方法】" not in html
+    assert "line1<br>line2" in html
+
+
+def test_send_daily_digest_renders_one_message_per_language(monkeypatch):
+    m = mailer_module.Mailer()
+    m.user = "a@foxmail.com"
+    m.password = "x"
+    m.default_language = "zh-CN"
+    m.recipient_groups = {"zh-CN": ["zh@example.com"], "en": ["en@example.com"]}
+    sent = []
+
+    class FakeServer:
+        def send_message(self, msg, to_addrs=None):
+            sent.append((msg, to_addrs))
+
+    monkeypatch.setattr(m, "_open_smtp", FakeServer)
+    monkeypatch.setattr(m, "_close_smtp", lambda server: None)
+
+    papers = [{
+        "title": "T",
+        "authors": ["A"],
+        "summary": "abstract",
+        "pdf_url": "http://pdf",
+        "ai_summary_fields": {"one_liner": "中文总结"},
+        "ai_summary_i18n": {"en": {"one_liner": "English TL;DR"}},
+    }]
+    m.send_daily_digest(papers)
+
+    assert [r for _, r in sent] == [["zh@example.com"], ["en@example.com"]]
+    zh_html = sent[0][0].get_payload()[0].get_payload(decode=True).decode("utf-8")
+    en_html = sent[1][0].get_payload()[0].get_payload(decode=True).decode("utf-8")
+    assert "中文总结" in zh_html and "English TL;DR" not in zh_html
+    assert "<strong>TL;DR:</strong> English TL;DR" in en_html
+    assert papers[0]["ai_summary_fields"] == {"one_liner": "中文总结"}
+
+
+def test_send_daily_digest_logs_in_once_per_language_group(monkeypatch):
+    logins = []
+    sent = []
+
+    class FakeSMTPSSL:
+        def __init__(self, host, port, timeout=20):
+            self.sent = 0
+
+        def login(self, user, password):
+            logins.append(user)
+
+        def send_message(self, msg, to_addrs=None):
+            # The first session is dropped by the server after one message.
+            if len(logins) == 1 and self.sent == 1:
+                raise mailer_module.smtplib.SMTPServerDisconnected("closed")
+            self.sent += 1
+            sent.append(to_addrs)
+
+        def quit(self):
+            return
+
+    monkeypatch.setattr(mailer_module.smtplib, "SMTP_SSL", FakeSMTPSSL)
+    m = mailer_module.Mailer()
+    m.user = "a@foxmail.com"
+    m.password = "x"
+    m.smtp_host = "smtp.qq.com"
+    m.smtp_port = 465
+    m.default_language = "zh-CN"
+    m.recipient_groups = {"zh-CN": ["a@example.com", "b@example.com", "c@example.com"]}
+    papers = [{"title": "T", "authors": ["A"], "summary": "s", "pdf_url": "http://pdf"}]
+
+    assert m.send_daily_digest(papers) is True
+    assert sent == [["a@example.com"], ["b@example.com"], ["c@example.com"]]
+    assert len(logins) == 2
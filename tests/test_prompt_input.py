@@ -0,0 +1,70 @@
+import pytest
+
+from prompt_input import TokenCounter, normalize_abstract
+
+
+def test_normalize_abstract_strips_latex_and_wraps():
+    raw = (
+        "We propose a method with $\\mathcal{O}(n \\log n)$ complexity and \\emph{strong}\n"
+        "guarantees~\\cite{foo}. Accuracy improves by 5\\% ($\\sim$3x) with $\\alpha=0.5$ and\n"
+        "$x_{i}^{2}$ terms, see \\textbf{\\emph{Table 1}}."
+    )
+
+    assert normalize_abstract(raw) == (
+        "We propose a method with O(n log n) complexity and strong guarantees. "
+        "Accuracy improves by 5% (~3x) with α=0.5 and x_i^2 terms, see Table 1."
+    )
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("$\\mathcal{O}(\\sqrt{T})$", "O(√T)"),
+    ("$\\tilde{O}(d\\sqrt{T})$", "Õ(d√T)"),
+    ("$\\frac{a}{b}$", "a/b"),
+    ("$\\frac{1}{n+1}$", "1/(n+1)"),
+    ("$\\hat{\\theta}$", "θ\u0302"),
+    ("$\\bar{x}$", "x\u0304"),
+    ("$\\{x\\}$", "{x}"),
+    ("$x^{n+1}$", "x^(n+1)"),
+    ("$\\left(a\\right)$", "(a)"),
+    ("$\\foo{T}$", "foo T"),
+])
+def test_math_commands_stay_readable(raw, expected):
+    assert normalize_abstract(raw) == expected
+
+
+def test_escaped_dollars_are_not_math():
+    raw = "Cost drops from \\$5 to \\$2 per run, i.e. $x^{2}$ cheaper."
+
+    assert normalize_abstract(raw) == "Cost drops from $5 to $2 per run, i.e. x^2 cheaper."
+
+
+def test_tilde_is_kept_in_urls():
+    raw = "Code at \\url{https://x.org/~me/tool} and x.org/~me; see Fig.~2 and Smith et~al.~\\cite{s} for details."
+
+    assert normalize_abstract(raw) == "Code at https://x.org/~me/tool and x.org/~me; see Fig. 2 and Smith et al. for details."
+
+
+def test_normalize_abstract_handles_empty_input():
+    assert normalize_abstract(None) == ""
+    assert normalize_abstract("  \n ") == ""
+
+
+def test_truncate_prefers_sentence_boundary():
+    counter = TokenCounter()
+    text = "First sentence is here. Second sentence is a bit longer than the first one. " * 20
+
+    cut = counter.truncate(text, 30)
+
+    assert counter.count(cut) <= 30
+    assert cut.endswith(". …")
+    assert counter.truncate("short text", 30) == "short text"
+
+
+def test_truncate_counts_cjk_text():
+    counter = TokenCounter()
+    text = "这是一个很长的中文摘要。" * 50
+
+    cut = counter.truncate(text, 40)
+
+    assert counter.count(cut) <= 40
+    assert cut.endswith("。 …")
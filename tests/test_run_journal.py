@@ -0,0 +1,142 @@
+import asyncio
+import importlib.util
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+import mailer as mailer_module
+from run_journal import RunJournal
+from tests.conftest import SRC_DIR
+
+
+def _papers():
+    return [
+        {"entry_id": "a", "title": "A", "published": datetime(2024, 5, 13, tzinfo=timezone.utc)},
+        {"entry_id": "b", "title": "B", "published": datetime(2024, 5, 13, tzinfo=timezone.utc)},
+    ]
+
+
+def test_journal_replays_completed_stages(tmp_path):
+    journal = RunJournal.for_date(str(tmp_path), "2024-05-14")
+    assert not journal.resumed
+
+    journal.record_fetched(_papers())
+    journal.record_summary({"entry_id": "a", "ai_summary": "sum", "ai_summary_fields": {"one_liner": "x"}})
+    journal.record_summary({"entry_id": "b", "ai_summary": None})
+    journal.record_delivered("r1@example.com")
+
+    resumed = RunJournal.for_date(str(tmp_path), "2024-05-14")
+    assert resumed.resumed and not resumed.completed
+    assert resumed.papers[0]["published"] == datetime(2024, 5, 13, tzinfo=timezone.utc)
+    assert resumed.delivered == {"r1@example.com"}
+
+    papers = resumed.papers
+    pending = resumed.apply_summaries(papers)
+    assert [p["entry_id"] for p in pending] == ["b"]
+    assert papers[0]["ai_summary_fields"] == {"one_liner": "x"}
+
+    resumed.record_completed()
+    assert RunJournal.for_date(str(tmp_path), "2024-05-14").completed
+
+
+def test_torn_last_line_is_ignored_and_terminated(tmp_path):
+    journal = RunJournal.for_date(str(tmp_path), "2024-05-14")
+    journal.record_fetched(_papers())
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "summary", "entry_id": "a", "ai_sum')
+
+    resumed = RunJournal(journal.path)
+    resumed.record_delivered("r1@example.com")
+
+    again = RunJournal(journal.path)
+    assert again.resumed and not again.summaries
+    assert again.delivered == {"r1@example.com"}
+
+
+def test_dry_run_journal_is_not_persisted(tmp_path):
+    journal = RunJournal.for_date(None, "2024-05-14")
+    journal.record_fetched(_papers())
+
+    assert journal.path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_process_papers_reports_each_summary(monkeypatch):
+    import llm_processor as llm_module
+
+    processor = llm_module.LLMProcessor.__new__(llm_module.LLMProcessor)
+    processor.client = object()
+    processor.http_pool = type("Pool", (), {"stats": lambda self: {}})()
+
+    async def fake_summarize(paper):
+        paper["ai_summary"] = f"summary {paper['entry_id']}"
+        return paper
+
+    monkeypatch.setattr(processor, "summarize_paper", fake_summarize)
+    monkeypatch.setattr(processor, "usage_stats", lambda: {})
+    seen = []
+    asyncio.run(processor.process_papers(_papers(), on_summarized=lambda p: seen.append(p["entry_id"])))
+
+    assert sorted(seen) == ["a", "b"]
+
+
+def test_mailer_skips_delivered_recipients_and_records_new_ones(tmp_path, monkeypatch):
+    journal = RunJournal.for_date(str(tmp_path), "2024-05-14")
+    journal.record_delivered("done@example.com")
+
+    m = mailer_module.Mailer()
+    m.user = "a@foxmail.com"
+    m.password = "x"
+    m.default_language = "zh-CN"
+    m.recipient_groups = {"zh-CN": ["done@example.com", "new@example.com", "bad@example.com"]}
+    sent = []
+
+    class FakeServer:
+        def send_message(self, msg, to_addrs=None):
+            if to_addrs == ["bad@example.com"]:
+                raise mailer_module.smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no such user")})
+            sent.append((msg["To"], msg["Message-ID"]))
+
+    monkeypatch.setattr(m, "_open_smtp", FakeServer)
+    monkeypatch.setattr(m, "_close_smtp", lambda server: None)
+    papers = [{"title": "T", "authors": ["A"], "summary": "s", "pdf_url": "http://pdf"}]
+
+    assert m.send_daily_digest(papers, journal=journal) is False
+    assert [to for to, _ in sent] == ["new@example.com"]
+    assert sent[0][1].startswith("<arxiv-digest-") and sent[0][1].endswith("@foxmail.com>")
+    assert RunJournal(journal.path).delivered == {"done@example.com", "new@example.com"}
+
+
+def test_failed_fetch_is_not_journaled_and_rerun_fetches_again(tmp_path, monkeypatch):
+    # Load src/main.py explicitly; the repo-root main.py shim shares its module name.
+    spec = importlib.util.spec_from_file_location("digest_main", os.path.join(SRC_DIR, "main.py"))
+    main_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(main_module)
+
+    monkeypatch.delenv("DRY_RUN", raising=False)
+    monkeypatch.setattr(main_module.settings, "_config", {**main_module.settings._config, "state_dir": str(tmp_path)})
+    calls = []
+
+    class FailingClient:
+        def fetch_papers(self):
+            calls.append("fetch")
+            raise main_module.ArxivFetchError("connection reset")
+
+    monkeypatch.setattr(main_module, "ArxivClient", FailingClient)
+    with pytest.raises(SystemExit) as exc:
+        asyncio.run(main_module.main())
+    assert exc.value.code == 1
+    assert list(tmp_path.iterdir()) == []
+
+    class EmptyClient:
+        def fetch_papers(self):
+            calls.append("fetch")
+            return []
+
+    monkeypatch.setattr(main_module, "ArxivClient", EmptyClient)
+    asyncio.run(main_module.main())
+
+    assert calls == ["fetch", "fetch"]
+    (journal_path,) = tmp_path.iterdir()
+    assert RunJournal(str(journal_path)).completed
@@ -0,0 +1,62 @@
+from summary_parser import FIELD_KEYS, parse_summary
+from tests.conftest import FULL_RESPONSE
+
+
+def test_parse_complete_summary():
+    summary = parse_summary(FULL_RESPONSE)
+
+    assert summary.is_complete
+    assert summary.fields["method"] == "失败轨迹→定位错误步骤→局部重试"
+    assert summary.keywords == ["LLM", "智能体", "程序修复"]
+    assert parse_summary(summary.to_text()).fields == summary.fields
+
+
+def test_parse_tolerates_markdown_and_colon_headers():
+    text = """好的，以下是解读：
+**【一句话总结】** 一个新方法。
+- 背景/痛点：现有方法太慢，
+  而且难以扩展。
+### 【核心方法】：输入→处理→输出"""
+    summary = parse_summary(text)
+
+    assert summary.fields["one_liner"] == "一个新方法。"
+    assert summary.fields["background"] == "现有方法太慢， 而且难以扩展。"
+    assert summary.fields["method"] == "输入→处理→输出"
+
+
+def test_parse_bold_and_numbered_labels():
+    text = """**一句话总结**：A
+- **核心方法**: C
+**背景/痛点：** B
+1. 【结论/效果】R
+2) 局限与风险：L
+【主要贡献】D"""
+    summary = parse_summary(text)
+
+    assert summary.fields == {
+        "one_liner": "A", "method": "C", "background": "B",
+        "results": "R", "limitations": "L", "contributions": "D",
+    }
+
+
+def test_missing_and_placeholder_fields_are_reported():
+    text = FULL_RESPONSE.replace("【局限与风险】仅在 Python 仓库上验证", "【局限与风险】…")
+    text = text.replace("【关键词】LLM，智能体，程序修复", "")
+    summary = parse_summary(text)
+
+    assert summary.missing == ["limitations", "keywords"]
+
+
+def test_merge_only_fills_missing_fields():
+    base = parse_summary("【一句话总结】原始总结\n【关键词】…")
+    repair = parse_summary("【一句话总结】不应覆盖\n【关键词】A, B, C")
+    merged = base.merge(repair)
+
+    assert merged.fields["one_liner"] == "原始总结"
+    assert merged.fields["keywords"] == "A, B, C"
+    assert merged.missing == [k for k in FIELD_KEYS if k not in ("one_liner", "keywords")]
+
+
+def test_unstructured_text_yields_no_fields():
+    assert parse_summary("This paper is about agents.").fields == {}
+    assert parse_summary(None).fields == {}
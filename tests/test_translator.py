@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from translator import SummaryTranslator
+
+
+class FakeProcessor:
+    language = "zh-CN"
+    client = object()
+
+    def __init__(self):
+        self.prompts = []
+        self.systems = []
+
+    async def complete(self, prompt, system=None):
+        self.prompts.append(prompt)
+        self.systems.append(system)
+        source = json.loads(prompt)
+        return "```json\n" + json.dumps({
+            pid: {key: f"EN {value}" for key, value in fields.items()}
+            for pid, fields in source.items()
+        }, ensure_ascii=False) + "\n```"
+
+
+def _papers(n):
+    return [
+        {"entry_id": f"id-{i}", "ai_summary_fields": {"one_liner": f"总结{i}", "keywords": "甲，乙，丙"}}
+        for i in range(n)
+    ]
+
+
+def test_translations_are_batched_and_cached(tmp_path):
+    processor = FakeProcessor()
+    translator = SummaryTranslator(processor, cache_dir=str(tmp_path), batch_size=4)
+    papers = _papers(6) + [{"entry_id": "no-summary", "ai_summary_fields": None}]
+
+    asyncio.run(translator.translate_papers(papers, ["zh-CN", "en"]))
+
+    assert len(processor.prompts) == 2
+    assert all("en" in system for system in processor.systems)
+    assert papers[5]["ai_summary_i18n"]["en"] == {"one_liner": "EN 总结5", "keywords": "EN 甲，乙，丙"}
+    assert "ai_summary_i18n" not in papers[6]
+
+    # A second run is served entirely from the cache, unless the source changed.
+    again = _papers(6)
+    again[0]["ai_summary_fields"]["one_liner"] = "新的总结"
+    asyncio.run(translator.translate_papers(again, ["en"]))
+
+    assert len(processor.prompts) == 3
+    assert '"新的总结"' in processor.prompts[-1] and "总结1" not in processor.prompts[-1]
+    assert again[1]["ai_summary_i18n"]["en"]["one_liner"] == "EN 总结1"
+
+
+def test_incomplete_translation_is_rejected():
+    class PartialProcessor(FakeProcessor):
+        async def complete(self, prompt, system=None):
+            return json.dumps({"0": {"one_liner": "TL;DR only"}})
+
+    papers = _papers(1)
+    asyncio.run(SummaryTranslator(PartialProcessor()).translate_papers(papers, ["en"]))
+
+    assert "ai_summary_i18n" not in papers[0]